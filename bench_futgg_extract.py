@@ -0,0 +1,35 @@
+# bench_futgg_extract.py
+# Micro-benchmark for futgg_scrape's JSON player extraction.
+#   python bench_futgg_extract.py captured_nuxt1.json captured_nuxt2.json ...
+# With no arguments a synthetic Nuxt 2 shaped payload is used: the XI under "data",
+# followed by a large "state" store full of card-like {"name", "rating"} objects.
+import sys, json, time, random
+
+from futgg_scrape import _players_from_json_blobs
+
+def _synthetic_blob(noise_nodes: int = 50_000) -> dict:
+    rnd = random.Random(7)
+    noise = [{"id": i, "name": f"Card {i}", "rating": rnd.randint(45, 99), "meta": {"tags": [rnd.random() for _ in range(3)]}}
+             for i in range(noise_nodes)]
+    squad = {"players": [{"player": {"name": f"Player {i}", "rating": 80 + i % 10},
+                          "price": {"ps": 1000 + i, "xbox": 900 + i, "pc": 1100 + i}} for i in range(11)]}
+    return {"layout": "default", "data": [{"page": {"squad": squad}}], "state": {"catalog": noise}}
+
+def _load(paths: list[str]) -> list:
+    blobs = []
+    for p in paths:
+        with open(p, "r", encoding="utf-8") as f:
+            blobs.append(json.load(f))
+    return blobs
+
+def main():
+    blobs = _load(sys.argv[1:]) if len(sys.argv) > 1 else [_synthetic_blob()]
+    runs = 20
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        players = _players_from_json_blobs(blobs)
+    dt = (time.perf_counter() - t0) / runs
+    print(f"{len(blobs)} blob(s): {len(players)} players in {dt * 1000:.2f} ms/run")
+
+if __name__ == "__main__":
+    main()
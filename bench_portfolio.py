@@ -0,0 +1,113 @@
+# bench_portfolio.py
+# Query-cost benchmark for the portfolio cog's storage, against a seeded dataset.
+#   python bench_portfolio.py                              # 100k trades, in-memory SQLite
+#   python bench_portfolio.py --trades 500000 --db sqlite:///bench.db
+#   python bench_portfolio.py --db postgres://...          # same queries against Postgres, in its own schema
+# On Postgres everything lives in the BENCH_SCHEMA schema (dropped and recreated each run), so
+# the bot's tables are never touched. A SQLite file that already holds trades is refused unless
+# --drop is given.
+import sys, time, random, asyncio, argparse
+from datetime import datetime, timezone, timedelta
+
+import asyncpg
+
+from portfolio_db import create_pool, SQLITE_PREFIX
+from portfolio_migrations import migrate
+from portfolio_stats import record_trade, rebuild_stats, fetch_stats, fetch_leaderboard
+from trade_import import COLUMNS
+
+BENCH_SCHEMA = "bench_portfolio"
+TABLES = ("trades", "trader_stats", "trader_tag_counts", "guild_traders", "positions", "portfolio", "schema_migrations")
+PLAYERS = [f"Player {i}" for i in range(2000)]
+TAGS = [None, "flip", "sbc", "investment", "snipe"]
+
+def _trades(n: int, users: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    out = []
+    for _ in range(n):
+        buy = rnd.randint(200, 100_000)
+        sell = max(150, int(buy * rnd.uniform(0.85, 1.25)))
+        qty = rnd.randint(1, 5)
+        ea_tax = round(sell * 0.05 * qty)
+        out.append((f"user{rnd.randrange(users)}", rnd.choice(PLAYERS), "Gold Rare", buy, sell, qty,
+                    rnd.choice(("PS", "XBOX", "PC")), rnd.choice(TAGS), None, ea_tax,
+                    round((sell - buy) * qty - ea_tax), now - timedelta(minutes=rnd.randrange(60 * 24 * 120))))
+    return out
+
+async def _timed(label: str, coro_fn, runs: int = 20):
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        result = await coro_fn()
+    dt = (time.perf_counter() - t0) / runs
+    print(f"{label:<32} {dt * 1000:9.2f} ms/run")
+    return result
+
+async def _open(db: str, drop: bool):
+    if not db.startswith(SQLITE_PREFIX):
+        conn = await asyncpg.connect(db)
+        try:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            await conn.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+        finally:
+            await conn.close()
+        return await asyncpg.create_pool(db, server_settings={"search_path": BENCH_SCHEMA})
+    pool = await create_pool(db)
+    async with pool.acquire() as conn:
+        has_trades = await conn.fetchval("SELECT 1 FROM sqlite_master WHERE type='table' AND name='trades'")
+        if has_trades and await conn.fetchval("SELECT EXISTS (SELECT 1 FROM trades)") and not drop:
+            await pool.close()
+            sys.exit(f"{db} already holds trades; pass --drop to wipe it for the benchmark")
+        for table in TABLES:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}")
+    return pool
+
+async def main(db: str, n: int, users: int, drop: bool = False):
+    pool = await _open(db, drop)
+    await migrate(pool)
+
+    records = _trades(n, users)
+    async with pool.acquire() as conn:
+        t0 = time.perf_counter()
+        async with conn.transaction():
+            await conn.copy_records_to_table("trades", records=records, columns=list(COLUMNS))
+        print(f"{'seed ' + format(n, ',') + ' trades (COPY)':<32} {(time.perf_counter() - t0) * 1000:9.2f} ms")
+        await conn.executemany("INSERT INTO guild_traders (guild_id, user_id) VALUES ($1, $2)",
+                               [("1", f"user{u}") for u in range(users)])
+        await _timed("rebuild_stats (everyone)", lambda: rebuild_stats(conn), runs=1)
+
+        uid = "user0"
+        await _timed("rebuild_stats (one user)", lambda: rebuild_stats(conn, uid))
+        await _timed("fetch_stats", lambda: fetch_stats(conn, uid), runs=200)
+
+        async def logtrade():
+            async with conn.transaction():
+                await conn.execute("""
+                    INSERT INTO trades (user_id, player, version, buy, sell, quantity, platform, tag, notes, ea_tax, profit, timestamp)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                """, *records[0][:11], datetime.now(timezone.utc))
+                await record_trade(conn, uid, records[0][1], records[0][7], records[0][10], records[0][9])
+        await _timed("logtrade + record_trade", logtrade, runs=200)
+
+        await _timed("saleshistory", lambda: conn.fetch("""
+            SELECT player, quantity, sell, profit, timestamp
+            FROM trades WHERE user_id=$1
+            ORDER BY timestamp DESC LIMIT 10
+        """, uid), runs=200)
+        await _timed("profitgraph", lambda: conn.fetch(
+            "SELECT profit, timestamp FROM trades WHERE user_id=$1 AND timestamp IS NOT NULL ORDER BY timestamp", uid))
+
+        now = datetime.now(timezone.utc)
+        for window, since in (("day", now - timedelta(days=1)), ("week", now - timedelta(days=7)), ("season", now - timedelta(days=365))):
+            rows = await _timed(f"leaderboard ({window})", lambda: fetch_leaderboard(conn, "1", since, 3))
+        print(f"{len(rows)} traders ranked; top by profit: {min(rows, key=lambda r: r['profit_rank'])['user_id']}")
+    await pool.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a portfolio database and time the cog's queries")
+    parser.add_argument("--db", default="sqlite:///:memory:", help="DATABASE_URL to benchmark (default: in-memory SQLite)")
+    parser.add_argument("--trades", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--drop", action="store_true", help="allow wiping a SQLite file that already holds trades")
+    args = parser.parse_args()
+    asyncio.run(main(args.db, args.trades, args.users, args.drop))
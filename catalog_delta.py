@@ -0,0 +1,73 @@
+# catalog_delta.py
+import os, json, time, hashlib
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+CATALOG_FILE = "players_temp.json"
+DELTA_FILE   = "players_delta.json"
+
+def card_key(p: Dict[str, Any]) -> str:
+    """Everything the catalog scraper reads for a card (prices are filled elsewhere)."""
+    return json.dumps({k: v for k, v in p.items() if k != "prices"}, sort_keys=True, ensure_ascii=False)
+
+def page_fingerprint(rows: List[Dict[str, Any]]) -> str:
+    return hashlib.sha1("\n".join(card_key(p) for p in rows).encode()).hexdigest()
+
+def write_json_atomic(path: str, data, indent: Optional[int] = None) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+def load_delta(path: str = DELTA_FILE) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def current_seq(path: str = DELTA_FILE) -> int:
+    """Sequence number of the catalog on disk (0 before the first delta)."""
+    d = load_delta(path)
+    return d["seq"] if d else 0
+
+def write_delta(added, updated, removed, full_walk: bool, reload: bool = False, path: str = DELTA_FILE) -> Dict[str, Any]:
+    """
+    Publish the change from the previous catalog (base_seq) to the one just written (seq).
+    reload=True (a full rebuild) carries no rows: readers must reload the catalog file.
+    """
+    base = current_seq(path)
+    delta = {
+        "seq": base + 1,
+        "base_seq": None if reload else base,
+        "generated_at": time.time(),
+        "full_walk": full_walk,
+        "added": list(added),
+        "updated": list(updated),
+        "removed": list(removed),
+    }
+    write_json_atomic(path, delta)
+    return delta
+
+def apply_delta(players: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """New catalog list with the delta applied; idempotent, so applying it twice is harmless."""
+    removed = set(delta.get("removed") or [])
+    changed = {p["id"]: p for p in (delta.get("updated") or []) + (delta.get("added") or [])}
+    out = []
+    for p in players:
+        if p["id"] in removed: continue
+        out.append(changed.pop(p["id"], p))
+    out.extend(p for p in changed.values() if p["id"] not in removed)
+    return out
+
+def sync_players(players: List[Dict[str, Any]], seq: int,
+                 reload: Callable[[], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Bring an in-memory catalog at `seq` up to date: apply the latest delta if it follows on
+    directly, otherwise (missed deltas, full rebuild) fall back to `reload()`.
+    """
+    delta = load_delta()
+    if not delta or delta["seq"] == seq:
+        return players, seq
+    if delta["base_seq"] == seq:
+        return apply_delta(players, delta), delta["seq"]
+    return reload(), delta["seq"]
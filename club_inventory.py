@@ -0,0 +1,105 @@
+# club_inventory.py
+import os, io, csv, json, sqlite3
+from typing import List, Dict, Any, Optional
+
+from sbc_core import map_player
+
+INVENTORY_PATH = os.getenv("CLUB_INVENTORY_PATH", "club_inventory.sqlite3")
+
+def parse_inventory(data: bytes, filename: str = "") -> List[Dict[str, Any]]:
+    """
+    Club export as JSON (list of player objects) or CSV with a header row.
+    Column names follow map_player (name, rating/ovr, league, nation, club, position, id/pid/defId).
+    """
+    text = data.decode("utf-8-sig", errors="ignore").strip()
+    if filename.lower().endswith(".json") or text.startswith(("[", "{")):
+        raw = json.loads(text)
+        if isinstance(raw, dict):
+            raw = raw.get("players") or raw.get("items") or []
+    else:
+        raw = list(csv.DictReader(io.StringIO(text)))
+    out = []
+    for row in raw:
+        if not isinstance(row, dict): continue
+        row = {(k or "").strip().lower() if isinstance(k, str) else k: v for k, v in row.items()}
+        try:
+            pl = map_player(row)
+        except (TypeError, ValueError):
+            continue
+        if pl["name"] and pl["rating"]:
+            untradeable = str(row.get("untradeable") or row.get("untradable") or "").lower() in ("1", "true", "yes", "y")
+            out.append({**pl, "untradeable": untradeable})
+    return out
+
+class InventoryStore:
+    """Per-user owned club players in SQLite, indexed for the SBC lookups (rating, league, nation)."""
+    def __init__(self, path: str = INVENTORY_PATH):
+        self.path = path
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS inventory (
+                    user_id TEXT NOT NULL,
+                    pid TEXT,
+                    name TEXT NOT NULL,
+                    rating INTEGER NOT NULL,
+                    league TEXT,
+                    nation TEXT,
+                    club TEXT,
+                    position TEXT,
+                    untradeable INTEGER DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS inventory_user_rating ON inventory (user_id, rating);
+                CREATE INDEX IF NOT EXISTS inventory_user_league ON inventory (user_id, league);
+                CREATE INDEX IF NOT EXISTS inventory_user_nation ON inventory (user_id, nation);
+            """)
+        return self._conn
+
+    def import_cards(self, user_id: str, cards: List[Dict[str, Any]], replace: bool = True) -> int:
+        """One transaction, one executemany — thousands of cards are a single bulk write."""
+        rows = [
+            (user_id, str(c["pid"]) if c.get("pid") else None, c["name"], int(c["rating"]),
+             c.get("league_name") or "", c.get("nation_name") or "", c.get("club_name") or "",
+             c.get("position") or "", 1 if c.get("untradeable") else 0)
+            for c in cards
+        ]
+        db = self._db()
+        with db:
+            if replace:
+                db.execute("DELETE FROM inventory WHERE user_id=?", (user_id,))
+            db.executemany("""
+                INSERT INTO inventory (user_id, pid, name, rating, league, nation, club, position, untradeable)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        return len(rows)
+
+    def owned_cards(self, user_id: str, min_rating: int = 0, max_rating: int = 99,
+                    league: Optional[str] = None, nation: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Owned cards as solver cards: price 0 and owned=True."""
+        sql = "SELECT pid, name, rating, league, nation, club, position, untradeable FROM inventory WHERE user_id=? AND rating BETWEEN ? AND ?"
+        args = [user_id, min_rating, max_rating]
+        if league:
+            sql += " AND league=?"; args.append(league)
+        if nation:
+            sql += " AND nation=?"; args.append(nation)
+        return [
+            {"pid": r[0], "name": r[1], "rating": r[2], "league_name": r[3], "nation_name": r[4],
+             "club_name": r[5], "position": r[6], "untradeable": bool(r[7]), "price": 0, "owned": True}
+            for r in self._db().execute(sql, args)
+        ]
+
+    def summary(self, user_id: str) -> Dict[int, int]:
+        """{rating: cards owned}"""
+        rows = self._db().execute(
+            "SELECT rating, COUNT(*) FROM inventory WHERE user_id=? GROUP BY rating ORDER BY rating DESC", (user_id,)
+        ).fetchall()
+        return {r: n for r, n in rows}
+
+    def clear(self, user_id: str) -> int:
+        db = self._db()
+        with db:
+            return db.execute("DELETE FROM inventory WHERE user_id=?", (user_id,)).rowcount
@@ -1,22 +1,48 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import json
 import os
-import asyncpg
-from datetime import datetime
+import time
+import aiohttp
+from datetime import datetime, timezone, timedelta
 import matplotlib.pyplot as plt
 from dotenv import load_dotenv
 
+from catalog_delta import current_seq, sync_players
+from portfolio_db import create_pool
+from portfolio_migrations import migrate
+from portfolio_stats import record_trade, rebuild_stats, fetch_stats, join_guild, fetch_leaderboard
+from trade_import import parse_trades, COLUMNS, MAX_IMPORT_ROWS
+from utils.futbin_api import get_prices
+
 load_dotenv()
 
 DB_URL = os.getenv("DATABASE_URL")
 PLAYERS_FILE = "players_temp.json"
+SEASON_START = datetime.fromisoformat(os.getenv("SEASON_START", "2024-09-20")).replace(tzinfo=timezone.utc)
+LEADERBOARD_TTL = {"day": 60, "week": 300, "season": 900}  # seconds a cached board is reused
+LEADERBOARD_MIN_TRADES = 3  # needed to rank on ROI / win rate
 
 class PortfolioSlash(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.catalog_seq = current_seq()
         self.players = self.load_players()
+        self.session = None
+        self.leaderboards = {}  # (guild_id, window) -> (built_at, rows)
+        self.guild_traders = set()  # (guild_id, user_id) in guild_traders; loaded in cog_load
+        self.catalog_sync.start()
+
+    def cog_unload(self):
+        self.catalog_sync.cancel()
+        if self.session:
+            self.bot.loop.create_task(self.session.close())
+
+    @tasks.loop(minutes=5)
+    async def catalog_sync(self):
+        # apply fetch_players.py --incremental deltas instead of reloading the whole catalog
+        self.players, self.catalog_seq = sync_players(self.players, self.catalog_seq, self.load_players)
 
     def load_players(self):
         try:
@@ -26,30 +52,14 @@ class PortfolioSlash(commands.Cog):
             return []
 
     async def cog_load(self):
-        self.pool = await asyncpg.create_pool(DB_URL)
+        self.pool = await create_pool(DB_URL)  # postgres://... or sqlite:///portfolio.db
+        applied = await migrate(self.pool)
+        if applied:
+            print("Portfolio migrations applied:", ", ".join(applied))
+        # memberships from earlier runs too, so invalidation reaches every board a trader is on
         async with self.pool.acquire() as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS portfolio (
-                    user_id TEXT PRIMARY KEY,
-                    starting_balance INTEGER DEFAULT 0
-                )
-            """)
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS trades (
-                    user_id TEXT,
-                    player TEXT,
-                    version TEXT,
-                    buy INTEGER,
-                    sell INTEGER,
-                    quantity INTEGER,
-                    platform TEXT,
-                    tag TEXT,
-                    notes TEXT,
-                    ea_tax INTEGER,
-                    profit INTEGER,
-                    timestamp TEXT
-                )
-            """)
+            rows = await conn.fetch("SELECT guild_id, user_id FROM guild_traders")
+        self.guild_traders = {(int(r["guild_id"]), r["user_id"]) for r in rows}
 
     async def player_autocomplete(self, interaction: discord.Interaction, current: str):
         results = [
@@ -58,6 +68,41 @@ class PortfolioSlash(commands.Cog):
         ]
         return results[:25]
 
+    async def card_autocomplete(self, interaction: discord.Interaction, current: str):
+        # value is the FUTBIN id so /positions can price the exact card
+        return [
+            app_commands.Choice(name=f"{p['name']} ({p['rating']})", value=str(p["id"]))
+            for p in self.players if p.get("id") and current.lower() in p["name"].lower()
+        ][:25]
+
+    async def position_autocomplete(self, interaction: discord.Interaction, current: str):
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, player, quantity, buy FROM positions
+                WHERE user_id=$1 AND player ILIKE '%' || $2 || '%'
+                ORDER BY opened_at DESC LIMIT 25
+            """, str(interaction.user.id), current)
+        return [
+            app_commands.Choice(name=f"#{r['id']} {r['player']} x{r['quantity']} @ {r['buy']:,}", value=r["id"])
+            for r in rows
+        ]
+
+    def invalidate_leaderboards(self, guild_id, user_id: str):
+        # called after a trade commits (which also joined the trader): drop the boards of every
+        # server the trader is on, including ones where they had no trades in the window yet
+        if guild_id:
+            self.guild_traders.add((guild_id, user_id))
+        guilds = {g for (g, u) in self.guild_traders if u == user_id}
+        for key, (_, rows) in list(self.leaderboards.items()):
+            if key[0] in guilds or any(r["user_id"] == user_id for r in rows):
+                del self.leaderboards[key]
+
+    def find_card(self, value: str):
+        for p in self.players:
+            if str(p.get("id")) == value:
+                return p
+        return next((p for p in self.players if p["name"].lower() == value.lower()), None)
+
     @app_commands.command(name="setcoins", description="💰 Set your starting coin balance")
     async def setcoins(self, interaction: discord.Interaction, amount: int):
         user_id = str(interaction.user.id)
@@ -90,27 +135,164 @@ class PortfolioSlash(commands.Cog):
         user_id = str(interaction.user.id)
         ea_tax = round(sell * 0.05 * quantity)
         profit = round((sell - buy) * quantity - ea_tax)
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = datetime.now(timezone.utc)
 
-        async with self.pool.acquire() as conn:
+        async with self.pool.acquire() as conn, conn.transaction():
             await conn.execute("""
                 INSERT INTO trades (user_id, player, version, buy, sell, quantity, platform, tag, notes, ea_tax, profit, timestamp)
                 VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
             """, user_id, player, version, buy, sell, quantity, platform.value, tag, notes, ea_tax, profit, timestamp)
+            await record_trade(conn, user_id, player, tag, profit, ea_tax)
+            await join_guild(conn, interaction.guild_id, user_id)
+        self.invalidate_leaderboards(interaction.guild_id, user_id)
 
         await interaction.response.send_message(f"✅ Logged: `{player}` x{quantity} | 🟢 Profit: `{profit:,}` coins | 💸 Tax: `{ea_tax:,}`", ephemeral=True)
 
+    @app_commands.command(name="logbuy", description="🛒 Log a buy you haven't sold yet")
+    @app_commands.describe(
+        player="Player card",
+        version="Card version (e.g. Gold Rare, TOTW)",
+        buy="Buy price (per card)",
+        quantity="Quantity bought",
+        platform="Platform used",
+        tag="Optional tag/category",
+        notes="Optional notes"
+    )
+    @app_commands.choices(platform=[
+        app_commands.Choice(name="PlayStation", value="PS"),
+        app_commands.Choice(name="Xbox", value="XBOX"),
+        app_commands.Choice(name="PC", value="PC")
+    ])
+    @app_commands.autocomplete(player=card_autocomplete)
+    async def logbuy(self, interaction: discord.Interaction, player: str, version: str, buy: int, quantity: int, platform: app_commands.Choice[str], tag: str = None, notes: str = None):
+        if quantity <= 0:
+            return await interaction.response.send_message("❌ Quantity must be at least 1.", ephemeral=True)
+        card = self.find_card(player)
+        name = card["name"] if card else player
+        card_id = str(card["id"]) if card and card.get("id") else None
+        async with self.pool.acquire() as conn:
+            pid = await conn.fetchval("""
+                INSERT INTO positions (user_id, player, card_id, version, buy, quantity, platform, tag, notes)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9) RETURNING id
+            """, str(interaction.user.id), name, card_id, version, buy, quantity, platform.value, tag, notes)
+        note = "" if card_id else " (card not in the price list — it won't be valued)"
+        await interaction.response.send_message(f"✅ Opened position #{pid}: `{name}` x{quantity} @ `{buy:,}`{note}", ephemeral=True)
+
+    @app_commands.command(name="sellposition", description="💱 Sell an open position and log the trade")
+    @app_commands.describe(position="Open position", sell="Sell price (per card)", quantity="How many to sell (default: all)")
+    @app_commands.autocomplete(position=position_autocomplete)
+    async def sellposition(self, interaction: discord.Interaction, position: int, sell: int, quantity: int = None):
+        user_id = str(interaction.user.id)
+        async with self.pool.acquire() as conn, conn.transaction():
+            pos = await conn.fetchrow("SELECT * FROM positions WHERE id=$1 AND user_id=$2 FOR UPDATE", position, user_id)
+            if not pos:
+                return await interaction.response.send_message("❌ No such open position.", ephemeral=True)
+            qty = min(quantity or pos["quantity"], pos["quantity"])
+            if qty <= 0:
+                return await interaction.response.send_message("❌ Quantity must be at least 1.", ephemeral=True)
+            if qty == pos["quantity"]:
+                await conn.execute("DELETE FROM positions WHERE id=$1", position)
+            else:
+                await conn.execute("UPDATE positions SET quantity = quantity - $2 WHERE id=$1", position, qty)
+
+            ea_tax = round(sell * 0.05 * qty)
+            profit = round((sell - pos["buy"]) * qty - ea_tax)
+            await conn.execute("""
+                INSERT INTO trades (user_id, player, version, buy, sell, quantity, platform, tag, notes, ea_tax, profit, timestamp)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+            """, user_id, pos["player"], pos["version"], pos["buy"], sell, qty, pos["platform"], pos["tag"], pos["notes"],
+                ea_tax, profit, datetime.now(timezone.utc))
+            await record_trade(conn, user_id, pos["player"], pos["tag"], profit, ea_tax)
+            await join_guild(conn, interaction.guild_id, user_id)
+        self.invalidate_leaderboards(interaction.guild_id, user_id)
+
+        left = pos["quantity"] - qty
+        await interaction.response.send_message(
+            f"✅ Sold `{pos['player']}` x{qty} | 🟢 Profit: `{profit:,}` coins | 💸 Tax: `{ea_tax:,}`"
+            + (f" | 📦 {left} still open" if left else ""), ephemeral=True)
+
+    @app_commands.command(name="positions", description="📦 Value your open positions at current prices")
+    async def positions(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("SELECT * FROM positions WHERE user_id=$1 ORDER BY opened_at", user_id)
+        if not rows:
+            return await interaction.response.send_message("📦 You have no open positions. Use `/logbuy` to add one.", ephemeral=True)
+        await interaction.response.defer(thinking=True)
+
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        # one cache-first lookup for every distinct card; misses go out as concurrent batches
+        prices = await get_prices(self.session, {r["card_id"] for r in rows if r["card_id"]})
+
+        cost = value = unrealised = 0
+        lines = []
+        for r in rows:
+            rec = prices.get(r["card_id"] or "")
+            price = rec.for_platform(r["platform"].lower()) if rec else 0
+            cost += r["buy"] * r["quantity"]
+            if not price:
+                lines.append((f"#{r['id']} {r['player']} x{r['quantity']}", f"Bought `{r['buy']:,}` · no current price"))
+                continue
+            # what selling now would net, after the same EA tax /logtrade charges
+            pnl = round((price - r["buy"]) * r["quantity"] - round(price * 0.05 * r["quantity"]))
+            value += price * r["quantity"]
+            unrealised += pnl
+            lines.append((f"#{r['id']} {r['player']} x{r['quantity']} ({r['platform']})",
+                          f"Bought `{r['buy']:,}` · Now `{price:,}` · {'🟢' if pnl >= 0 else '🔴'} `{pnl:+,}`"))
+
+        embed = discord.Embed(
+            title="📦 Open Positions",
+            description=f"💰 Cost `{cost:,}` · 📈 Market value `{value:,}` · Unrealised P&L `{unrealised:+,}` (after tax)",
+            color=0x2ecc71 if unrealised >= 0 else 0xe74c3c,
+        )
+        for name, val in lines[:25]:
+            embed.add_field(name=name, value=val, inline=False)
+        if len(lines) > 25:
+            embed.set_footer(text=f"…and {len(lines) - 25} more positions (included in the totals)")
+        await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="importtrades", description="📥 Import trades from a CSV file")
+    @app_commands.describe(file="CSV with columns player, version, buy, sell, quantity, platform (optional: tag, notes, timestamp)")
+    async def import_trades(self, interaction: discord.Interaction, file: discord.Attachment):
+        if not file.filename.lower().endswith(".csv"):
+            return await interaction.response.send_message("❌ Please upload a `.csv` file.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        user_id = str(interaction.user.id)
+        try:
+            records, errors = parse_trades(await file.read(), user_id)
+        except Exception as e:
+            return await interaction.followup.send(f"❌ Couldn't read `{file.filename}`: {e}", ephemeral=True)
+        if errors:
+            shown = "\n".join(errors[:10]) + (f"\n…and {len(errors) - 10} more" if len(errors) > 10 else "")
+            return await interaction.followup.send(f"❌ Nothing imported — fix these rows and try again:\n```{shown}```", ephemeral=True)
+        if not records:
+            return await interaction.followup.send(f"❌ No trades found (max {MAX_IMPORT_ROWS:,} rows per file).", ephemeral=True)
+
+        # one COPY and one stats rebuild instead of an INSERT + record_trade per row; all or nothing
+        try:
+            async with self.pool.acquire() as conn, conn.transaction():
+                await conn.copy_records_to_table("trades", records=records, columns=list(COLUMNS))
+                await rebuild_stats(conn, user_id)
+                await join_guild(conn, interaction.guild_id, user_id)
+        except Exception as e:
+            print("Trade import failed:", e)
+            return await interaction.followup.send(f"❌ Import failed, nothing was saved: {e}", ephemeral=True)
+        self.invalidate_leaderboards(interaction.guild_id, user_id)
+
+        total_profit = sum(r[COLUMNS.index("profit")] for r in records)
+        await interaction.followup.send(f"✅ Imported **{len(records):,}** trades | 🟢 Profit: `{total_profit:,}` coins", ephemeral=True)
+
     @app_commands.command(name="checkprofit", description="📊 View your profit summary")
     async def check_profit(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow("SELECT starting_balance FROM portfolio WHERE user_id=$1", user_id)
-            starting_balance = row["starting_balance"] if row else 0
-            stats = await conn.fetchrow("SELECT SUM(profit) AS total_profit, SUM(ea_tax) AS total_tax, COUNT(*) AS count FROM trades WHERE user_id=$1", user_id)
+            stats = await fetch_stats(conn, user_id)
 
+        starting_balance = stats["starting_balance"] or 0
         total_profit = stats["total_profit"] or 0
         total_tax = stats["total_tax"] or 0
-        count = stats["count"]
+        count = stats["trades"] or 0
         current_balance = starting_balance + total_profit
 
         embed = discord.Embed(title="📊 Your Trading Portfolio", color=0x2ecc71)
@@ -137,7 +319,7 @@ class PortfolioSlash(commands.Cog):
 
         embed = discord.Embed(title="📄 Recent Sales History", color=0x00b0f4)
         for i, row in enumerate(rows, 1):
-            date = datetime.fromisoformat(row["timestamp"]).strftime("%d %b @ %H:%M")
+            date = row["timestamp"].strftime("%d %b @ %H:%M") if row["timestamp"] else "—"
             embed.add_field(
                 name=f"{i}. {row['player']} x{row['quantity']}",
                 value=(
@@ -154,45 +336,118 @@ class PortfolioSlash(commands.Cog):
     async def trader_profile(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
         async with self.pool.acquire() as conn:
-            trades = await conn.fetch("SELECT * FROM trades WHERE user_id=$1", user_id)
-
-        total_profit = sum(t["profit"] or 0 for t in trades)
-        win_count = len([t for t in trades if t["profit"] is not None and t["profit"] > 0])
-        win_rate = (win_count / len(trades) * 100) if trades else 0
-        best_trade = max((t for t in trades if t["profit"] is not None), key=lambda t: t["profit"], default=None)
-    
+            stats = await fetch_stats(conn, user_id)
 
-        tag_count = {}
-        for t in trades:
-            tag = t["tag"] or "N/A"
-            tag_count[tag] = tag_count.get(tag, 0) + 1
-        most_used_tag = max(tag_count.items(), key=lambda x: x[1])[0] if tag_count else "N/A"
+        count = stats["trades"] or 0
+        total_profit = stats["total_profit"] or 0
+        win_rate = (stats["wins"] / count * 100) if count else 0
+        most_used_tag = stats["top_tag"] or "N/A"
 
-        best_trade = max(trades, key=lambda t: t["profit"], default=None)
         embed = discord.Embed(title="🧳️ Your Trader Profile", color=0x7289da)
         embed.add_field(name="💰 Total Profit", value=f"`{total_profit:,}`", inline=True)
-        embed.add_field(name="🖖️ Trades Logged", value=f"`{len(trades)}`", inline=True)
+        embed.add_field(name="🖖️ Trades Logged", value=f"`{count}`", inline=True)
         embed.add_field(name="📈 Win Rate", value=f"`{win_rate:.1f}%`", inline=True)
         embed.add_field(name="🏮 Most Used Tag", value=f"`{most_used_tag}`", inline=True)
 
-        if best_trade:
-            embed.add_field(name="🏆 Best Trade", value=f"{best_trade['player']} (+{best_trade['profit']:,})", inline=False)
+        if stats["best_profit"] is not None:
+            embed.add_field(name="🏆 Best Trade", value=f"{stats['best_player']} (+{stats['best_profit']:,})", inline=False)
 
         await interaction.response.send_message(embed=embed)
 
+    @app_commands.command(name="rebuildstats", description="🔧 Recompute trader stats from the trade log")
+    @app_commands.describe(everyone="Rebuild every trader's stats (admins only)")
+    async def rebuild_stats_cmd(self, interaction: discord.Interaction, everyone: bool = False):
+        if everyone and not interaction.user.guild_permissions.administrator:
+            return await interaction.response.send_message("❌ You need admin permissions.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        async with self.pool.acquire() as conn:
+            n = await rebuild_stats(conn, None if everyone else str(interaction.user.id))
+        await interaction.followup.send(f"✅ Rebuilt stats for **{n}** trader{'s' if n != 1 else ''}.", ephemeral=True)
+
+    @app_commands.command(name="leaderboard", description="🏆 Rank this server's traders")
+    @app_commands.describe(metric="What to rank by", window="Time window")
+    @app_commands.choices(
+        metric=[
+            app_commands.Choice(name="Profit", value="profit"),
+            app_commands.Choice(name="ROI", value="roi"),
+            app_commands.Choice(name="Win rate", value="winrate"),
+        ],
+        window=[
+            app_commands.Choice(name="Today", value="day"),
+            app_commands.Choice(name="This week", value="week"),
+            app_commands.Choice(name="Season", value="season"),
+        ],
+    )
+    async def leaderboard(self, interaction: discord.Interaction, metric: app_commands.Choice[str] = None, window: app_commands.Choice[str] = None):
+        if not interaction.guild_id:
+            return await interaction.response.send_message("❌ Leaderboards are per server — use this in a server.", ephemeral=True)
+        metric = metric.value if metric else "profit"
+        window = window.value if window else "week"
+        user_id = str(interaction.user.id)
+
+        key = (interaction.guild_id, window)
+        member = (interaction.guild_id, user_id)
+        cached = self.leaderboards.get(key)
+        fresh = cached and time.time() - cached[0] <= LEADERBOARD_TTL[window]
+        # a cache hit from a known trader touches the database not at all
+        if not fresh or member not in self.guild_traders:
+            async with self.pool.acquire() as conn:
+                if member not in self.guild_traders:
+                    # asking for the board puts you on it, once per server
+                    if await join_guild(conn, interaction.guild_id, user_id):
+                        fresh = False
+                    self.guild_traders.add(member)
+                if not fresh:
+                    since = SEASON_START if window == "season" else \
+                        datetime.now(timezone.utc) - timedelta(days=1 if window == "day" else 7)
+                    rows = await fetch_leaderboard(conn, str(interaction.guild_id), since, LEADERBOARD_MIN_TRADES)
+                    cached = self.leaderboards[key] = (time.time(), rows)
+        built_at, rows = cached
+
+        rank_col = f"{metric}_rank"
+        if metric != "profit":
+            rows = [r for r in rows if r["trades"] >= LEADERBOARD_MIN_TRADES]
+        rows = sorted(rows, key=lambda r: r[rank_col])
+        if not rows:
+            return await interaction.response.send_message("📭 No trades in this window yet.", ephemeral=True)
+
+        def score(r):
+            if metric == "roi": return f"{(r['roi'] or 0) * 100:+.1f}% ROI"
+            if metric == "winrate": return f"{r['win_rate'] * 100:.1f}% wins"
+            return f"{r['profit']:+,} coins"
+
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        lines = [
+            f"{medals.get(r[rank_col], f'`#{r[rank_col]}`')} <@{r['user_id']}> — **{score(r)}** · {r['trades']} trades"
+            for r in rows[:10]
+        ]
+        me = next((r for r in rows if r["user_id"] == user_id), None)
+        if me and me[rank_col] > 10:
+            lines.append(f"…\n`#{me[rank_col]}` <@{user_id}> — **{score(me)}** · {me['trades']} trades")
+
+        titles = {"profit": "Profit", "roi": "ROI", "winrate": "Win Rate"}
+        windows = {"day": "Today", "week": "This Week", "season": "This Season"}
+        embed = discord.Embed(title=f"🏆 {titles[metric]} Leaderboard — {windows[window]}",
+                              description="\n".join(lines), color=0xf1c40f)
+        footer = f"{len(rows)} traders"
+        if metric != "profit":
+            footer += f" with {LEADERBOARD_MIN_TRADES}+ trades"
+        embed.set_footer(text=f"{footer} · updated {int(time.time() - built_at)}s ago")
+        await interaction.response.send_message(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+
     @app_commands.command(name="profitgraph", description="📈 Visualise your profit over time")
     async def profit_graph(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT starting_balance FROM portfolio WHERE user_id=$1", user_id)
             start = row["starting_balance"] if row else 0
-            rows = await conn.fetch("SELECT profit, timestamp FROM trades WHERE user_id=$1 ORDER BY timestamp", user_id)
+            rows = await conn.fetch("SELECT profit, timestamp FROM trades WHERE user_id=$1 AND timestamp IS NOT NULL ORDER BY timestamp", user_id)
 
         if not rows:
             await interaction.response.send_message("📅 No trades found to generate graph.", ephemeral=True)
             return
 
-        timestamps = [datetime.fromisoformat(r["timestamp"]) for r in rows]
+        timestamps = [r["timestamp"] for r in rows]
         profits = []
         running = start
         for r in rows:
@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import requests
 from bs4 import BeautifulSoup
@@ -12,6 +12,8 @@ import matplotlib.ticker as ticker
 import io
 from datetime import datetime
 
+from catalog_delta import current_seq, sync_players
+
 log = logging.getLogger("fut-pricecheck")
 log.setLevel(logging.INFO)
 handler = logging.StreamHandler()
@@ -23,7 +25,17 @@ log.addHandler(handler)
 class PriceCheck(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.catalog_seq = current_seq()
         self.players = self.load_players()
+        self.catalog_sync.start()
+
+    def cog_unload(self):
+        self.catalog_sync.cancel()
+
+    @tasks.loop(minutes=5)
+    async def catalog_sync(self):
+        # apply fetch_players.py --incremental deltas instead of reloading the whole catalog
+        self.players, self.catalog_seq = sync_players(self.players, self.catalog_seq, self.load_players)
 
     def load_players(self):
         try:
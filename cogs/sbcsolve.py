@@ -1,14 +1,20 @@
 # cogs/sbcsolve.py
-import os, re, time, json, difflib
+import os, re, time, json, asyncio
 import discord, aiohttp
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from bs4 import BeautifulSoup
 
-from futgg_scrape import futgg_fetch_sbc_parts, futgg_fetch_solution_players
+from futgg_scrape import futgg_fetch_sbc_parts, futgg_fetch_solution_players, STRATEGY_STATS, API_SHAPES
+from futbin_cheapest import futbin_cheapest_by_rating, normalize_platform_key, SWEEPER, PLATFORMS
+from sbc_solver import solve_cheapest_squad, cards_from_cheapest
+from rating_cost import RatingCostTable, TABLE_RATINGS
+from sbc_requirements import compile_requirements, check_requirements, UNKNOWN
+from club_inventory import InventoryStore, parse_inventory
 
 FUTGG_BASE     = "https://www.fut.gg"
 SBC_CACHE_TTL  = 600
+ALERT_CONFIG   = "sbc_alert_config.json"
 UA             = {"User-Agent": "Mozilla/5.0 (compatible; SBCSolver/FUTGG-Only 1.0)"}
 
 def _norm(s: str) -> str:
@@ -20,18 +26,194 @@ def _norm(s: str) -> str:
 def _clean_title(t: str) -> str:
     return re.sub(r"[,\-–]\s*\d[\d,\.kK]+\s*(coins)?$", "", t.strip(), flags=re.I)
 
+def _trigrams(s: str) -> set[str]:
+    s = f"  {s} "
+    return {s[i:i+3] for i in range(len(s) - 2)}
+
+class SBCTitleIndex:
+    """
+    Built once per SBC list refresh: normalised titles and their trigram postings.
+    Substring queries intersect the trigram postings of the query before confirming with `in`;
+    fuzzy queries score only titles sharing a trigram (Dice coefficient).
+    Ranking is deterministic: title prefix > word-start match > inner match, then list order.
+    """
+    def __init__(self, items):
+        self.items = items
+        self.norms = [_norm(t) for t, _ in items]
+        self.grams: dict[str, set[int]] = {}
+        self._gram_sets = []
+        for i, n in enumerate(self.norms):
+            g = _trigrams(n)
+            self._gram_sets.append(g)
+            for gram in g:
+                self.grams.setdefault(gram, set()).add(i)
+
+    def _rank(self, i: int, q: str):
+        n = self.norms[i]
+        if n.startswith(q): return (0, i)
+        if f" {q}" in n: return (1, i)
+        return (2, i)
+
+    def contains(self, q: str) -> list[int]:
+        """Indexes of titles whose normalised form contains q, best first."""
+        if not q: return list(range(len(self.items)))
+        if len(q) < 3:
+            hits = [i for i, n in enumerate(self.norms) if q in n]
+        else:
+            grams = {q[i:i+3] for i in range(len(q) - 2)}
+            cand = None
+            for g in sorted(grams, key=lambda g: len(self.grams.get(g, ()))):
+                post = self.grams.get(g)
+                if not post: return []
+                cand = set(post) if cand is None else cand & post
+                if not cand: return []
+            hits = [i for i in cand if q in self.norms[i]]
+        return sorted(hits, key=lambda i: self._rank(i, q))
+
+    def similar(self, q: str, cutoff: float) -> list[tuple[float, int]]:
+        qg = _trigrams(q)
+        shared: dict[int, int] = {}
+        for g in qg:
+            for i in self.grams.get(g, ()):
+                shared[i] = shared.get(i, 0) + 1
+        scored = []
+        for i, k in shared.items():
+            score = 2 * k / (len(qg) + len(self._gram_sets[i]))
+            if score >= cutoff: scored.append((score, i))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return scored
+
 class SBCSolver(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self._sbc_cache = {"items": [], "ts": 0.0}
+        self._title_index = SBCTitleIndex([])
+        self.session: aiohttp.ClientSession | None = None
+        self._rating_tables: dict[str, RatingCostTable] = {}
+        self._rating_version = -1
+        self.inventory = InventoryStore()
+        self.alerts = self._load_alerts()
+        self._list_validators: dict[str, str] = {}
+        self.cheapest_sweep.start()
+        self.sbc_poll.start()
+
+    async def cog_load(self):
+        self.session = aiohttp.ClientSession()
+
+    async def cog_unload(self):
+        self.cheapest_sweep.cancel()
+        self.sbc_poll.cancel()
+        if self.session:
+            await self.session.close()
+
+    # ---- Background FUTBIN cheapest sweep ----
+    @tasks.loop(minutes=2)
+    async def cheapest_sweep(self):
+        try:
+            await SWEEPER.sweep(self._get_session())
+            if SWEEPER.version != self._rating_version:
+                self._rating_version = SWEEPER.version
+                for plat in PLATFORMS:
+                    await self._rebuild_rating_table(plat)
+        except Exception as e:
+            print("Cheapest sweep error:", e)
+
+    @cheapest_sweep.before_loop
+    async def _before_sweep(self):
+        await self.bot.wait_until_ready()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def _fetch_part_xi(self, session, part) -> list[dict]:
+        if not part.get("solution_url"):
+            return []
+        try:
+            return await futgg_fetch_solution_players(session, part["solution_url"])
+        except Exception:
+            return []
+
+    # ---- New SBC alerts ----
+    def _load_alerts(self) -> dict:
+        try:
+            with open(ALERT_CONFIG, "r") as f:
+                cfg = json.load(f)
+        except (OSError, ValueError):
+            cfg = {}
+        cfg.setdefault("channels", {})   # guild_id -> {"channel_id", "ping_role"}
+        cfg.setdefault("seen", None)     # SBC urls in the last snapshot (None until the first poll)
+        return cfg
+
+    def _save_alerts(self):
+        with open(ALERT_CONFIG, "w") as f:
+            json.dump(self.alerts, f, indent=2)
+
+    @tasks.loop(minutes=5)
+    async def sbc_poll(self):
+        try:
+            session = self._get_session()
+            items = await self._fetch_sbc_list_conditional(session)
+            if items is None:
+                # unchanged since the last poll, so the cached list is still current
+                if self._sbc_cache["items"]: self._sbc_cache["ts"] = time.time()
+                return
+            if not items:
+                return  # layout change or blocked page; keep the last snapshot
+            self._set_sbc_list(items)
+            seen = self.alerts["seen"]
+            # the first snapshot only records what's live; nothing in it is "new"
+            seen = set(seen) if seen is not None else {u for _, u in items}
+            new = [(t, u) for t, u in items if u not in seen]
+            self.alerts["seen"] = [u for _, u in items]
+            self._save_alerts()
+            for title, url in new:
+                parts = await self._warm_sbc(session, url)
+                await self._post_new_sbc(title, url, parts)
+        except Exception as e:
+            print("SBC poll error:", e)
+
+    @sbc_poll.before_loop
+    async def _before_poll(self):
+        await self.bot.wait_until_ready()
+
+    async def _warm_sbc(self, session, url: str) -> list[dict]:
+        """Fetch a new SBC's parts and solution XIs into the scrape cache so /sbcsolve is instant."""
+        try:
+            parts = await futgg_fetch_sbc_parts(session, url, force=True)
+        except Exception:
+            return []
+        async def xi(part):
+            try:
+                await futgg_fetch_solution_players(session, part["solution_url"], force=True)
+            except Exception:
+                pass
+        await asyncio.gather(*(xi(p) for p in parts[:3] if p.get("solution_url")))
+        return parts
+
+    async def _post_new_sbc(self, title: str, url: str, parts: list[dict]):
+        e = discord.Embed(title=f"🆕 New SBC — {title}", url=url, description="Source: FUT.GG", colour=discord.Colour.gold())
+        for part in parts[:3]:
+            reqs = "\n".join(f"• {r}" for r in (part.get("requirements") or []))
+            cost = f"\nEst. {part['cost']:,} coins" if part.get("cost") else ""
+            e.add_field(name=part.get("title") or title, value=((reqs or "—") + cost)[:1024], inline=False)
+        e.set_footer(text="Use /sbcsolve for the solution XI")
+        for guild_id, cfg in self.alerts["channels"].items():
+            channel = self.bot.get_channel(cfg["channel_id"])
+            if not channel: continue
+            content = f"<@&{cfg['ping_role']}>" if cfg.get("ping_role") else None
+            try:
+                await channel.send(content=content, embed=e)
+            except discord.HTTPException as ex:
+                print(f"SBC alert to guild {guild_id} failed:", ex)
 
     async def fetch_html(self, session: aiohttp.ClientSession, url: str) -> str:
         async with session.get(url, headers=UA, timeout=25) as r:
             r.raise_for_status()
             return await r.text()
 
-    async def _fetch_futgg_sbc_list(self, session):
-        html = await self.fetch_html(session, f"{FUTGG_BASE}/sbc/")
+    def _parse_sbc_list(self, html: str):
         soup = BeautifulSoup(html, "html.parser")
         out = []
         for a in soup.select('a[href^="/sbc/"]'):
@@ -48,6 +230,29 @@ class SBCSolver(commands.Cog):
         uniq.sort(key=lambda x: x[0].lower())
         return uniq
 
+    async def _fetch_futgg_sbc_list(self, session):
+        return self._parse_sbc_list(await self.fetch_html(session, f"{FUTGG_BASE}/sbc/"))
+
+    async def _fetch_sbc_list_conditional(self, session):
+        """The SBC list, or None when FUT.GG answers 304 to our ETag/Last-Modified."""
+        headers = dict(UA)
+        if self._list_validators.get("etag"): headers["If-None-Match"] = self._list_validators["etag"]
+        if self._list_validators.get("last_modified"): headers["If-Modified-Since"] = self._list_validators["last_modified"]
+        async with session.get(f"{FUTGG_BASE}/sbc/", headers=headers, timeout=25) as r:
+            if r.status == 304:
+                return None
+            r.raise_for_status()
+            html = await r.text()
+            validators = {"etag": r.headers.get("ETag", ""), "last_modified": r.headers.get("Last-Modified", "")}
+        items = self._parse_sbc_list(html)
+        # an empty parse (layout change, error page served as 200) must not be pinned by a 304 forever
+        self._list_validators = validators if items else {}
+        return items
+
+    def _set_sbc_list(self, items):
+        self._sbc_cache = {"items": items, "ts": time.time()}
+        self._title_index = SBCTitleIndex(items)
+
     async def get_sbc_list_cached(self, session, force: bool = False):
         now = time.time()
         if not force and self._sbc_cache["items"] and (now - self._sbc_cache["ts"] < SBC_CACHE_TTL):
@@ -56,19 +261,22 @@ class SBCSolver(commands.Cog):
             items = await self._fetch_futgg_sbc_list(session)
         except Exception:
             items = []
-        self._sbc_cache = {"items": items, "ts": now}
+        self._set_sbc_list(items)
         return items
 
+    def _index_for(self, items) -> SBCTitleIndex:
+        return self._title_index if self._title_index.items is items else SBCTitleIndex(items)
+
     def fuzzy_pick(self, items, query):
         if not items: return None, []
+        idx = self._index_for(items)
         qn = _norm(query)
-        for t,u in items:
-            if qn and qn in _norm(t): return (t,u), []
-        norm_map = { _norm(t): (t,u) for t,u in items }
-        best = difflib.get_close_matches(qn, list(norm_map.keys()), n=1, cutoff=0.4)
-        sugg = difflib.get_close_matches(qn, list(norm_map.keys()), n=6, cutoff=0.3)
-        picked = norm_map[best[0]] if best else None
-        suggestions = [norm_map[s][0] for s in sugg if s in norm_map][:5]
+        if qn:
+            hits = idx.contains(qn)
+            if hits: return items[hits[0]], []
+        scored = idx.similar(qn, cutoff=0.3)
+        picked = items[scored[0][1]] if scored and scored[0][0] >= 0.4 else None
+        suggestions = [items[i][0] for _, i in scored[:5]]
         return picked, suggestions
 
     @app_commands.command(name="sbcsolve", description="Find SBC on FUT.GG and show requirements + XI from the View Solution")
@@ -76,78 +284,251 @@ class SBCSolver(commands.Cog):
     async def sbcsolve(self, interaction: discord.Interaction, sbcname: str | None = None):
         await interaction.response.defer(thinking=True)
 
-        async with aiohttp.ClientSession() as session:
-            items = await self.get_sbc_list_cached(session)
+        session = self._get_session()
+        items = await self.get_sbc_list_cached(session)
 
-            if not sbcname:
-                embed = discord.Embed(title="Current SBCs (FUT.GG)", colour=discord.Colour.green())
-                for t,u in items[:15]:
-                    embed.add_field(name=t, value=f"[Open]({u})", inline=False)
-                await interaction.followup.send(embed=embed)
-                return
+        if not sbcname:
+            embed = discord.Embed(title="Current SBCs (FUT.GG)", colour=discord.Colour.green())
+            for t,u in items[:15]:
+                embed.add_field(name=t, value=f"[Open]({u})", inline=False)
+            await interaction.followup.send(embed=embed)
+            return
 
-            pick, suggestions = self.fuzzy_pick(items, sbcname)
-            if not pick:
-                msg = f"No SBC found matching “{sbcname}”."
-                if suggestions: msg += "\nDid you mean:\n• " + "\n• ".join(suggestions)
-                await interaction.followup.send(msg); return
+        pick, suggestions = self.fuzzy_pick(items, sbcname)
+        if not pick:
+            msg = f"No SBC found matching “{sbcname}”."
+            if suggestions: msg += "\nDid you mean:\n• " + "\n• ".join(suggestions)
+            await interaction.followup.send(msg); return
 
-            title, link = pick
-            parts = await futgg_fetch_sbc_parts(session, link)
-            if not parts:
-                await interaction.followup.send(f"Couldn't read details for **{title}**.")
-                return
+        title, link = pick
+        parts = await futgg_fetch_sbc_parts(session, link)
+        if not parts:
+            await interaction.followup.send(f"Couldn't read details for **{title}**.")
+            return
+
+        # Resolve every part's XI concurrently (futgg_scrape.SEM bounds the fan-out);
+        # gather keeps results in part order.
+        parts = parts[:3]
+        xis = await asyncio.gather(*(self._fetch_part_xi(session, p) for p in parts))
+
+        embeds = []
+        for part, xi in zip(parts, xis):
+            e = discord.Embed(
+                title=f"{title} — {part['title']}",
+                description="Source: FUT.GG",
+                colour=discord.Colour.green() if xi else discord.Colour.blurple()
+            )
+
+            req_text = "\n".join(f"• {r}" for r in (part.get("requirements") or []))[:1024]
+            if req_text:
+                e.add_field(name="Requirements", value=req_text, inline=False)
+
+            total_txt = f"{part['cost']:,} coins" if part.get("cost") else "—"
+            e.add_field(name="Estimated Total", value=total_txt, inline=False)
 
-            embeds = []
-            for part in parts[:3]:
-                xi = []
-                if part.get("solution_url"):
-                    try:
-                        xi = await futgg_fetch_solution_players(session, part["solution_url"])
-                    except Exception:
-                        xi = []
+            if xi:
+                lines = [f"{p.get('rating',0):>2} — {p['name']}" for p in xi]
+                e.add_field(name="XI", value="\n".join(lines)[:1024] or "—", inline=False)
+                reqs, _ = compile_requirements(part.get("requirements") or [])
+                if len(xi) == 11:
+                    checks = [c for c in check_requirements(reqs, ratings=[_p.get("rating", 0) for _p in xi])
+                              if c[0].kind == "team_rating" and c[2] is not None]
+                    for req, actual, ok in checks[:1]:
+                        e.add_field(name="XI Team Rating", value=f"{actual} {'✅' if ok else '❌'} (needs {req.value})", inline=False)
+            else:
+                e.add_field(name="XI", value="— (couldn't read solution XI)", inline=False)
 
-                e = discord.Embed(
-                    title=f"{title} — {part['title']}",
-                    description="Source: FUT.GG",
-                    colour=discord.Colour.green() if xi else discord.Colour.blurple()
-                )
+            if part.get("solution_url"):
+                e.set_footer(text="View Solution on FUT.GG")
+                e.url = part["solution_url"]
 
-                req_text = "\n".join(f"• {r}" for r in (part.get("requirements") or []))[:1024]
-                if req_text:
-                    e.add_field(name="Requirements", value=req_text, inline=False)
+            embeds.append(e)
 
-                total_txt = f"{part['cost']:,} coins" if part.get("cost") else "—"
-                e.add_field(name="Estimated Total", value=total_txt, inline=False)
+        await interaction.followup.send(embeds=embeds)
 
-                if xi:
-                    lines = [f"{p.get('rating',0):>2} — {p['name']}" for p in xi]
-                    e.add_field(name="XI", value="\n".join(lines)[:1024] or "—", inline=False)
-                else:
-                    e.add_field(name="XI", value="— (couldn't read solution XI)", inline=False)
+    async def _cheapest_tables(self, session, ratings, platform: str) -> dict:
+        """Swept tables where available; only ratings the sweeper hasn't reached yet are fetched."""
+        tables = SWEEPER.tables_for(platform, ratings)
+        async def one(r):
+            try:
+                rows = await futbin_cheapest_by_rating(session, r, platform)
+            except Exception:
+                rows = []
+            if rows: SWEEPER.put(platform, r, rows)
+            return r, rows
+        missing = [r for r in ratings if r not in tables]
+        tables.update(await asyncio.gather(*(one(r) for r in missing)))
+        return tables
+
+    async def _rebuild_rating_table(self, platform: str, tables: dict | None = None) -> RatingCostTable:
+        table = self._rating_tables.setdefault(platform, RatingCostTable())
+        tables = tables if tables is not None else SWEEPER.tables_for(platform, TABLE_RATINGS)
+        if any(tables.values()):
+            # rebuild is CPU-bound (~1s) and skipped when prices are unchanged; keep it off the event loop
+            await asyncio.to_thread(table.update, tables)
+        return table
+
+    async def get_rating_table(self, platform: str) -> RatingCostTable:
+        table = self._rating_tables.get(platform)
+        if table and table.rows:
+            return table
+        # first use before the sweeper has covered this platform
+        tables = await self._cheapest_tables(self._get_session(), TABLE_RATINGS, platform)
+        return await self._rebuild_rating_table(platform, tables)
+
+    def _cheapest_source(self, plat: str) -> str:
+        age = SWEEPER.age(plat, TABLE_RATINGS)
+        return "FUTBIN cheapest by rating" + (f" · prices up to {int(age // 60)} min old" if age is not None else "")
+
+    def _squad_embed(self, res: dict, plat: str, source: str) -> discord.Embed:
+        e = discord.Embed(
+            title=f"Cheapest {res['rating']} squad — {plat.upper()}",
+            description=f"Source: {source}",
+            colour=discord.Colour.green()
+        )
+        lines = [f"{c['rating']:>2} — {c['name']} · " + ("owned" if c.get("owned") else f"{c['price']:,}") for c in res["players"]]
+        e.add_field(name="XI", value="\n".join(lines)[:1024] or "—", inline=False)
+        owned = sum(1 for c in res["players"] if c.get("owned"))
+        total = f"{res['cost']:,} coins" + (f" ({owned} from your club)" if owned else "")
+        e.add_field(name="Estimated Total", value=total, inline=False)
+        if not res["optimal"]:
+            e.set_footer(text="Search hit its time limit — best squad found so far")
+        return e
+
+    @app_commands.command(name="ratingcost", description="Cheapest way to each squad rating (FUTBIN prices)")
+    @app_commands.describe(rating="Target squad rating (leave empty for the full table)", platform="Platform for prices")
+    @app_commands.choices(platform=[
+        app_commands.Choice(name="PlayStation", value="ps"),
+        app_commands.Choice(name="Xbox", value="xbox"),
+        app_commands.Choice(name="PC", value="pc")
+    ])
+    async def ratingcost(self, interaction: discord.Interaction, rating: int | None = None,
+                         platform: app_commands.Choice[str] = None):
+        await interaction.response.defer(thinking=True)
+        plat = normalize_platform_key(platform.value if platform else "ps")
+        table = await self.get_rating_table(plat)
+        if not table.rows:
+            await interaction.followup.send("Couldn't read FUTBIN's cheapest lists right now.")
+            return
+
+        if rating is not None:
+            res = table.squad(rating)
+            if not res:
+                await interaction.followup.send(f"No {rating} rating in the table (covers {min(table.rows)}–{max(table.rows)}).")
+                return
+            await interaction.followup.send(embed=self._squad_embed(res, plat, self._cheapest_source(plat)))
+            return
+
+        lines = []
+        for t, row in sorted(table.rows.items()):
+            comp = " ".join(f"{k}×{r}" for r, k in sorted(row["counts"].items(), reverse=True))
+            lines.append(f"**{t}** — {row['cost']:,} · {comp}")
+        e = discord.Embed(title=f"Squad rating costs — {plat.upper()}", description="\n".join(lines)[:4096], colour=discord.Colour.green())
+        age = SWEEPER.age(plat, TABLE_RATINGS)
+        e.set_footer(text=f"Prices up to {int((age or 0) // 60)} min old")
+        await interaction.followup.send(embed=e)
+
+    @app_commands.command(name="sbcbuild", description="Build the cheapest XI that reaches a squad rating (FUTBIN prices)")
+    @app_commands.describe(
+        rating="Target squad rating",
+        platform="Platform for prices",
+        min_player="Lowest player rating allowed",
+        max_player="Highest player rating allowed",
+        use_club="Use players from your imported club first (/importclub)"
+    )
+    @app_commands.choices(platform=[
+        app_commands.Choice(name="PlayStation", value="ps"),
+        app_commands.Choice(name="Xbox", value="xbox"),
+        app_commands.Choice(name="PC", value="pc")
+    ])
+    async def sbcbuild(self, interaction: discord.Interaction, rating: app_commands.Range[int, 60, 98],
+                       platform: app_commands.Choice[str] = None, min_player: int = 0, max_player: int = 99,
+                       use_club: bool = False):
+        await interaction.response.defer(thinking=True)
+        plat = normalize_platform_key(platform.value if platform else "ps")
+        owned = await asyncio.to_thread(self.inventory.owned_cards, str(interaction.user.id), min_player, max_player) if use_club else []
+        res = None
+        if not owned and min_player <= 0 and max_player >= 99:
+            res = (await self.get_rating_table(plat)).squad(rating)
+        if not res:
+            # owned cards go in at price 0, so only the slots they can't fill get priced
+            lo, hi = max(min_player, rating - 4), min(max_player, rating + 3)
+            tables = await self._cheapest_tables(self._get_session(), range(lo, hi + 1), plat)
+            # branch-and-bound can run for up to its 2 s time limit: keep it off the event loop
+            res = await asyncio.to_thread(solve_cheapest_squad, owned + cards_from_cheapest(tables), rating,
+                                          min_rating=min_player, max_rating=max_player)
+        if not res:
+            await interaction.followup.send(f"Couldn't build a {rating}-rated squad from FUTBIN's cheapest lists.")
+            return
+        await interaction.followup.send(embed=self._squad_embed(res, plat, self._cheapest_source(plat)))
+
+    @app_commands.command(name="importclub", description="Import your club players (CSV or JSON) for /sbcbuild")
+    @app_commands.describe(file="CSV with a header row (name, rating, league, nation, club, position) or a JSON list",
+                           replace="Replace your previously imported club (default) or add to it")
+    async def importclub(self, interaction: discord.Interaction, file: discord.Attachment, replace: bool = True):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            cards = parse_inventory(await file.read(), file.filename)
+        except Exception as e:
+            await interaction.followup.send(f"Couldn't read `{file.filename}`: {e}", ephemeral=True)
+            return
+        if not cards:
+            await interaction.followup.send("No players with a name and rating found in that file.", ephemeral=True)
+            return
+        n = await asyncio.to_thread(self.inventory.import_cards, str(interaction.user.id), cards, replace)
+        await interaction.followup.send(f"✅ Imported **{n:,}** players into your club.", ephemeral=True)
 
-                if part.get("solution_url"):
-                    e.set_footer(text="View Solution on FUT.GG")
-                    e.url = part["solution_url"]
+    @app_commands.command(name="myclub", description="Summary of your imported club players")
+    async def myclub(self, interaction: discord.Interaction):
+        summary = self.inventory.summary(str(interaction.user.id))
+        if not summary:
+            await interaction.response.send_message("You haven't imported a club yet — use /importclub.", ephemeral=True)
+            return
+        lines = [f"**{r}** × {n}" for r, n in summary.items()]
+        e = discord.Embed(title="Your club", description=" · ".join(lines)[:4096], colour=discord.Colour.green())
+        e.set_footer(text=f"{sum(summary.values()):,} players")
+        await interaction.response.send_message(embed=e, ephemeral=True)
 
-                embeds.append(e)
+    @app_commands.command(name="sbcalerts", description="⚙️ Post newly released SBCs to a channel")
+    @app_commands.describe(channel="Where to post (leave empty to turn alerts off)", ping_role="Optional ping role")
+    async def sbcalerts(self, interaction: discord.Interaction, channel: discord.TextChannel | None = None,
+                        ping_role: discord.Role | None = None):
+        if not interaction.user.guild_permissions.administrator:
+            return await interaction.response.send_message("❌ You need admin permissions.", ephemeral=True)
+        gid = str(interaction.guild.id)
+        if channel is None:
+            self.alerts["channels"].pop(gid, None)
+            self._save_alerts()
+            return await interaction.response.send_message("🔕 New SBC alerts turned off.")
+        self.alerts["channels"][gid] = {"channel_id": channel.id, "ping_role": ping_role.id if ping_role else None}
+        self._save_alerts()
+        await interaction.response.send_message(f"✅ New SBCs will be posted in {channel.mention}.")
 
-            await interaction.followup.send(embeds=embeds)
+    @app_commands.command(name="sbcstats", description="Debug: FUT.GG solution scraper strategy stats")
+    async def sbcstats(self, interaction: discord.Interaction):
+        lines = []
+        for st in STRATEGY_STATS.snapshot():
+            lines.append(
+                f"`{st['name']:<11}` {st['hits']}/{st['tries']} hits · "
+                f"~{st['mean_cost'] * 1000:.0f} ms · exp {st['expected_cost'] * 1000:.0f} ms"
+            )
+        shape = STRATEGY_STATS.api_shape
+        e = discord.Embed(title="SBC solution strategies", description="\n".join(lines) or "—", colour=discord.Colour.blurple())
+        e.add_field(name="API shape", value=f"`{API_SHAPES[shape]}`" if shape is not None else "— (guessing)", inline=False)
+        if UNKNOWN:
+            unk = "\n".join(f"{n}× {t}" for t, n in UNKNOWN.most_common(8))
+            e.add_field(name="Unparsed requirement bullets", value=unk[:1024], inline=False)
+        await interaction.response.send_message(embed=e, ephemeral=True)
 
     # ---- Autocomplete (10-min cache) ----
     @sbcsolve.autocomplete("sbcname")
     async def _sbcname_autocomplete(self, interaction: discord.Interaction, current: str):
         try:
-            async with aiohttp.ClientSession() as session:
-                items = await self.get_sbc_list_cached(session)
+            items = await self.get_sbc_list_cached(self._get_session())
         except Exception:
             return []
-        cur = _norm(current); out = []
-        for t,_ in items:
-            if not cur or cur in _norm(t):
-                out.append(t)
-            if len(out) >= 25: break
-        return [app_commands.Choice(name=s[:100], value=s[:100]) for s in out]
+        hits = self._index_for(items).contains(_norm(current))[:25]
+        return [app_commands.Choice(name=items[i][0][:100], value=items[i][0][:100]) for i in hits]
 
 async def setup(bot):
     await bot.add_cog(SBCSolver(bot))
\ No newline at end of file
@@ -1,6 +1,6 @@
-import discord
+import discord, aiohttp
 from discord.ext import commands, tasks
-from utils.futbin_api import get_player_price
+from utils.futbin_api import get_prices
 
 players_to_track = {
     "Mbappe": 231,
@@ -12,10 +12,13 @@ players_to_track = {
 class SnipingFeed(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.session = None
         self.sniping_loop.start()
 
     def cog_unload(self):
         self.sniping_loop.cancel()
+        if self.session:
+            self.bot.loop.create_task(self.session.close())
 
     @tasks.loop(minutes=5)
     async def sniping_loop(self):
@@ -24,13 +27,17 @@ class SnipingFeed(commands.Cog):
             print("No #sniping-feed channel found.")
             return
 
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        # one batched request for every tracked player
+        prices = await get_prices(self.session, players_to_track.values())
+
         for name, pid in players_to_track.items():
-            prices = get_player_price(pid)
-            if not prices:
+            rec = prices.get(str(pid))
+            if not rec or not rec.ps or not rec.xbox:
                 continue
             try:
-                ps_price = int(prices["ps"]["LCPrice"].replace(',', ''))
-                xbox_price = int(prices["xbox"]["LCPrice"].replace(',', ''))
+                ps_price, xbox_price = rec.ps, rec.xbox
                 avg_price = (ps_price + xbox_price) // 2
                 threshold = int(avg_price * 0.92)
 
@@ -1,108 +1,451 @@
 import os
 import json
 import time
-import undetected_chromedriver as uc
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from catalog_delta import apply_delta, card_key, page_fingerprint, write_json_atomic, write_delta
+from scrape_report import RunReport
 
 BASE_URL = "https://www.futbin.com/25/players?page="
 PLAYER_SELECTOR = "tr.player-row"
 TEMP_FILE = "players_temp.json"
+LOG_FILE = "players_temp.jsonl"
+CHECKPOINT_FILE = "players_checkpoint.json"
+PAGES_FILE = "players_pages.json"  # page -> fingerprint of its rows, for --incremental
+MAX_PAGES = 300  # Adjust upper limit if needed
+WINDOW = 8       # pages requested per batch in async mode; futbin_cheapest.SEM bounds how many are in flight
+STOP_AFTER = 2   # --incremental stops after this many pages in a row with nothing added or changed
+RETRIES = 2      # extra attempts for a page that hits 429/5xx or a connection error (HTTP modes)
 
-print("🔄 Resumable FUTBIN scraper starting...")
 
-# Load existing players if temp file exists
-if os.path.exists(TEMP_FILE):
-    with open(TEMP_FILE, "r", encoding="utf-8") as f:
-        try:
-            players = json.load(f)
-        except json.JSONDecodeError:
-            print("⚠️ Couldn't load temp file — starting fresh.")
-            players = []
-else:
-    players = []
+def parse_page(html):
+    """Player rows of one listing page (module-level so a process pool can run it)."""
+    soup = BeautifulSoup(html, "html.parser")
+    out = []
+    for row in soup.select(PLAYER_SELECTOR):
+        link = row.select_one("td.table-name a")
+        if not link or "player/" not in link["href"]:
+            continue
+
+        name = row.select_one("td.table-name .table-player-name")
+        rating = row.select_one("td.table-rating .rating-square")
+        pos = row.select_one("td.table-pos .table-pos-main")
+        club = row.select_one("td .table-player-club img")
+        nation = row.select_one("td .table-player-nation img")
+        league = row.select_one("td .table-player-league img")
 
-# Build a set of known IDs to avoid duplicates
-existing_ids = {p["id"] for p in players}
-start_page = (len(players) // 30) + 1
-print(f"📄 Resuming from page {start_page} (already have {len(players)} players)")
+        if not name or not rating:
+            continue  # Skip broken/incomplete rows
 
-# Setup undetected Chrome
-options = uc.ChromeOptions()
-options.headless = True
-driver = uc.Chrome(options=options)
+        out.append({
+            "id": link["href"].split("/")[3],
+            "name": name.text.strip(),
+            "rating": rating.text.strip(),
+            "position": pos.text.strip() if pos else None,
+            "club": club["title"] if club else None,
+            "nation": nation["title"] if nation else None,
+            "league": league["title"] if league else None,
+            "url": "https://www.futbin.com" + link["href"],
+            "prices": {
+                "ps": None,
+                "xbox": None
+            }
+        })
+    return out
+
+
+class CatalogRun:
+    """
+    Append-only progress for one catalog scrape:
+      LOG_FILE         one player per line, appended (and fsynced) as each page completes
+      CHECKPOINT_FILE  {"last_page": n, "skipped": [...]}, replaced atomically after the append
+    A crash between the two just redoes that page; ids already in the log are not written twice.
+    compact() writes the finished catalog to TEMP_FILE once, at the end.
+    """
+    def __init__(self, fresh=False):
+        if fresh:
+            for path in (LOG_FILE, CHECKPOINT_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
+        self.existing_ids = set()
+        self.count = 0
+        self._repair_log(seed=not fresh)
+        with open(LOG_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                self.existing_ids.add(json.loads(line)["id"])
+                self.count += 1
+        self.checkpoint = self._load_checkpoint()
+        self.page_hashes = {}
+        self.new_this_run = 0
+        self._log = open(LOG_FILE, "a", encoding="utf-8")
 
-try:
-    for page_num in range(start_page, 300):  # Adjust upper limit if needed
-        print(f"⏳ Scraping page {page_num}...")
-        driver.get(BASE_URL + str(page_num))
+    def _repair_log(self, seed):
+        if not os.path.exists(LOG_FILE):
+            with open(LOG_FILE, "w", encoding="utf-8") as f:
+                if seed:
+                    self._seed_from_catalog(f)
+            return
+        # drop a line torn by a crash mid-write, so the next append starts on a fresh line
+        with open(LOG_FILE, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
 
+    def _seed_from_catalog(self, f):
+        """First run after switching from the rewrite-everything temp file: carry its players over."""
+        if os.path.exists(CHECKPOINT_FILE) or not os.path.exists(TEMP_FILE):
+            return
         try:
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, PLAYER_SELECTOR)))
-        except Exception:
-            print(f"⚠️ Page {page_num} took too long to load. Skipping...")
-            continue
+            with open(TEMP_FILE, "r", encoding="utf-8") as src:
+                players = json.load(src)
+        except json.JSONDecodeError:
+            print("⚠️ Couldn't load temp file — starting fresh.")
+            return
+        for p in players:
+            f.write(json.dumps(p, ensure_ascii=False) + "\n")
+        # the log must be on disk before a checkpoint that claims its pages, as in page_done()
+        f.flush()
+        os.fsync(f.fileno())
+        # the old file had no page marker; this estimate is used once, then the checkpoint takes over
+        self._write_checkpoint({"last_page": len(players) // 30, "skipped": []})
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        rows = soup.select(PLAYER_SELECTOR)
+    def _load_checkpoint(self):
+        try:
+            with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"last_page": 0, "skipped": []}
+
+    def _write_checkpoint(self, cp):
+        write_json_atomic(CHECKPOINT_FILE, cp)
+
+    def pages(self):
+        """Pages skipped by earlier runs first, then everything after the last completed page."""
+        return self.checkpoint["skipped"] + list(range(self.checkpoint["last_page"] + 1, MAX_PAGES))
 
-        if not rows:
-            print("⚠️ No player rows found — likely blocked or page structure changed.")
-            break
+    def is_retry(self, page_num):
+        return page_num <= self.checkpoint["last_page"]
 
+    def page_done(self, page_num, rows):
+        """Log the page's new players, then move the checkpoint past it. Returns how many were new."""
         new_players = 0
-        for row in rows:
-            link = row.select_one("td.table-name a")
-            if not link or "player/" not in link["href"]:
+        for p in rows:
+            if p["id"] in self.existing_ids:
                 continue
+            self._log.write(json.dumps(p, ensure_ascii=False) + "\n")
+            self.existing_ids.add(p["id"])
+            new_players += 1
+            print(f"✅ {p['name']} ({p['rating']})")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.count += new_players
+        self.new_this_run += new_players
+        self.page_hashes[str(page_num)] = page_fingerprint(rows)
+        cp = self.checkpoint
+        if page_num in cp["skipped"]:
+            cp["skipped"].remove(page_num)
+        cp["last_page"] = max(cp["last_page"], page_num)
+        self._write_checkpoint(cp)
+        return new_players
+
+    def page_skipped(self, page_num):
+        cp = self.checkpoint
+        if page_num not in cp["skipped"]:
+            cp["skipped"].append(page_num)
+        cp["last_page"] = max(cp["last_page"], page_num)
+        self._write_checkpoint(cp)
+
+    def compact(self):
+        """Write the catalog (first occurrence of each id, in scrape order) to TEMP_FILE in one go."""
+        self._log.close()
+        players, seen = [], set()
+        with open(LOG_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                p = json.loads(line)
+                if p["id"] in seen:
+                    continue
+                seen.add(p["id"])
+                players.append(p)
+        write_json_atomic(TEMP_FILE, players, indent=2)
+        save_page_hashes({**load_page_hashes(), **self.page_hashes})
+        if self.new_this_run:
+            write_delta([], [], [], full_walk=False, reload=True)  # tell running cogs to reload
+        return len(players)
+
+
+def load_page_hashes():
+    try:
+        with open(PAGES_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_page_hashes(hashes):
+    write_json_atomic(PAGES_FILE, hashes)
+
+
+def scrape_selenium(run, report):
+    import undetected_chromedriver as uc
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-            player_id = link["href"].split("/")[3]
-            if player_id in existing_ids:
+    # Setup undetected Chrome
+    options = uc.ChromeOptions()
+    options.headless = True
+    driver = uc.Chrome(options=options)
+
+    try:
+        for page_num in run.pages():
+            print(f"⏳ Scraping page {page_num}...")
+            try:
+                with report.timed(page_num, "fetch"):
+                    driver.get(BASE_URL + str(page_num))
+                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, PLAYER_SELECTOR)))
+            except Exception:
+                print(f"⚠️ Page {page_num} took too long to load. Skipping...")
+                report.block(page_num, "timeout")
+                run.page_skipped(page_num)
                 continue
 
-            name = row.select_one("td.table-name .table-player-name")
-            rating = row.select_one("td.table-rating .rating-square")
-            pos = row.select_one("td.table-pos .table-pos-main")
-            club = row.select_one("td .table-player-club img")
-            nation = row.select_one("td .table-player-nation img")
-            league = row.select_one("td .table-player-league img")
-            url = "https://www.futbin.com" + link["href"]
-
-            if not name or not rating:
-                continue  # Skip broken/incomplete rows
-
-            player_data = {
-                "id": player_id,
-                "name": name.text.strip(),
-                "rating": rating.text.strip(),
-                "position": pos.text.strip() if pos else None,
-                "club": club["title"] if club else None,
-                "nation": nation["title"] if nation else None,
-                "league": league["title"] if league else None,
-                "url": url,
-                "prices": {
-                    "ps": None,
-                    "xbox": None
-                }
-            }
+            with report.timed(page_num, "parse"):
+                rows = parse_page(driver.page_source)
+            if not rows:
+                print("⚠️ No player rows found — likely blocked or page structure changed.")
+                report.block(page_num, "no rows")
+                break
 
-            players.append(player_data)
-            existing_ids.add(player_id)
-            new_players += 1
-            print(f"✅ {player_data['name']} ({player_data['rating']})")
+            retry = run.is_retry(page_num)
+            with report.timed(page_num, "write"):
+                new_players = run.page_done(page_num, rows)
+
+            if new_players == 0 and not retry:
+                print("⚠️ No new players found on this page. Might be done.")
+                break
+
+            with report.timed(page_num, "wait"):
+                time.sleep(3)
+    finally:
+        driver.quit()
+
+
+class PageFetcher:
+    """
+    Listing pages over one aiohttp session (cookies persist across pages), paced by
+    futbin_cheapest's SEM and LIMITER like every other FUTBIN request, parsed in a process pool.
+    """
+    def __init__(self, session, pool, report):
+        from futbin_cheapest import HEADERS
+        self.session, self.pool, self.report = session, pool, report
+        self.headers = dict(HEADERS)
+        if os.getenv("FUTBIN_COOKIE"):
+            self.headers["Cookie"] = os.getenv("FUTBIN_COOKIE")  # e.g. cf_clearance copied from a browser
+        self.fetched = 0
+        self.started = time.perf_counter()
+
+    async def page(self, page_num):
+        """Parsed rows, or None on an HTTP error."""
+        import aiohttp
+        from futbin_cheapest import SEM, LIMITER
+        report = self.report
+        for attempt in range(RETRIES + 1):
+            if attempt:
+                report.retry(page_num)
+                with report.timed(page_num, "wait"):
+                    await asyncio.sleep(2 ** attempt)
+            with report.timed(page_num, "wait"):
+                await SEM.acquire()
+            try:
+                with report.timed(page_num, "wait"):
+                    await LIMITER.wait()
+                with report.timed(page_num, "fetch"):
+                    async with self.session.get(BASE_URL + str(page_num), headers=self.headers, timeout=30) as r:
+                        status = r.status
+                        html = await r.text() if status == 200 else None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            finally:
+                SEM.release()
+            # connection errors (status is the exception name), throttling and 5xx are worth another go
+            if status == 200 or not (isinstance(status, str) or status in (429, 500, 502, 503, 504)):
+                break
+        if status != 200:
+            print(f"⚠️ Page {page_num}: {status if isinstance(status, str) else f'HTTP {status}'}")
+            report.block(page_num, status)
+            return None
+        self.fetched += 1
+        with report.timed(page_num, "parse"):
+            return await asyncio.get_running_loop().run_in_executor(self.pool, parse_page, html)
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.fetched / elapsed if elapsed else 0.0
+
+    def print_rate(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"⏱️ {self.fetched} pages in {elapsed:.1f}s ({self.rate():.2f} pages/sec)")
+        if self.fetched == 0:
+            print("⚠️ Nothing fetched over plain HTTP — set FUTBIN_COOKIE or use --mode selenium.")
+
+
+async def scrape_async(run, workers, report):
+    """Listing pages fetched WINDOW at a time by a PageFetcher and logged in page order."""
+    import aiohttp
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        async with aiohttp.ClientSession() as session:
+            fetcher = PageFetcher(session, pool, report)
+            pages = run.pages()
+            for i in range(0, len(pages), WINDOW):
+                nums = pages[i:i + WINDOW]
+                results = await asyncio.gather(*(fetcher.page(n) for n in nums))
+                done = False
+                for n, rows in zip(nums, results):
+                    if rows is None:
+                        run.page_skipped(n)  # HTTP error already reported; retried next run
+                        continue
+                    if not rows:
+                        print(f"⚠️ No player rows on page {n} — end of catalog, blocked, or page structure changed.")
+                        done = True
+                        break
+                    with report.timed(n, "write"):
+                        run.page_done(n, rows)
+                print(f"📊 Pages {nums[0]}-{nums[-1]} · {fetcher.rate():.2f} pages/sec · {run.count} players")
+                if done:
+                    break
+            fetcher.print_rate()
+
+
+async def refresh_incremental(workers, report):
+    """
+    Re-walk the catalog from page 1 and compare against TEMP_FILE. A page whose fingerprint
+    matches the last run is skipped card by card; otherwise each card is checked by id.
+    Paging stops after STOP_AFTER pages in a row with nothing added or changed; removals are
+    only known (and reported) when the walk reaches the end of the catalog with no failed pages.
+    The catalog, the resumable log and PAGES_FILE are updated, and the change is published as
+    a delta (catalog_delta.DELTA_FILE) for running cogs to apply.
+    """
+    import aiohttp
+
+    try:
+        with open(TEMP_FILE, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        print(f"⚠️ No catalog in {TEMP_FILE} to refresh — run a full scrape first.")
+        return
+    by_id = {p["id"]: p for p in catalog}
+    hashes = load_page_hashes()
+    added, updated, seen = {}, {}, set()
+    settled, failed, full_walk = 0, False, False
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        async with aiohttp.ClientSession() as session:
+            fetcher = PageFetcher(session, pool, report)
+            for first in range(1, MAX_PAGES, WINDOW):
+                nums = range(first, min(first + WINDOW, MAX_PAGES))
+                results = await asyncio.gather(*(fetcher.page(n) for n in nums))
+                done = False
+                for n, rows in zip(nums, results):
+                    if rows is None:
+                        failed, settled = True, 0
+                        continue
+                    if not rows:
+                        full_walk = done = True
+                        break
+                    seen.update(p["id"] for p in rows)
+                    fp = page_fingerprint(rows)
+                    changes = 0
+                    if hashes.get(str(n)) != fp:
+                        for p in rows:
+                            old = by_id.get(p["id"])
+                            if old is None:
+                                added[p["id"]] = p
+                            elif card_key(old) != card_key(p):
+                                updated[p["id"]] = p
+                            else:
+                                continue
+                            by_id[p["id"]] = p
+                            changes += 1
+                        hashes[str(n)] = fp
+                    settled = 0 if changes else settled + 1
+                    if settled >= STOP_AFTER:
+                        print(f"🛑 Pages {n - STOP_AFTER + 1}-{n} unchanged — stopping.")
+                        done = True
+                        break
+                print(f"📊 Pages {first}-{nums[-1]} · {fetcher.rate():.2f} pages/sec · +{len(added)} ~{len(updated)}")
+                if done:
+                    break
+            fetcher.print_rate()
+
+    removed = [pid for pid in by_id if pid not in seen] if full_walk and not failed else []
+    save_page_hashes(hashes)
+    if not (added or updated or removed):
+        print("✅ Catalog unchanged.")
+        return
+    delta = {"added": list(added.values()), "updated": list(updated.values()), "removed": removed}
+    catalog = apply_delta(catalog, delta)
+    write_json_atomic(TEMP_FILE, catalog, indent=2)
+    # keep the resumable log in step with the catalog it would otherwise compact over
+    with open(LOG_FILE + ".tmp", "w", encoding="utf-8") as f:
+        for p in catalog:
+            f.write(json.dumps(p, ensure_ascii=False) + "\n")
+    os.replace(LOG_FILE + ".tmp", LOG_FILE)
+    d = write_delta(delta["added"], delta["updated"], removed, full_walk=full_walk and not failed)
+    print(f"✅ Delta #{d['seq']}: {len(added)} added, {len(updated)} updated, {len(removed)} removed "
+          f"({len(catalog)} players).")
+
+
+def finish_report(report, path=None):
+    report.print_summary()
+    print(f"🧾 Run report: {report.write(path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the FUTBIN player catalog into " + TEMP_FILE)
+    parser.add_argument("--mode", choices=("selenium", "async"), default="selenium",
+                        help="selenium: one Chrome tab, page by page; async: concurrent HTTP + process-pool parsing")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="parser processes (async mode)")
+    parser.add_argument("--rps", type=float, default=None, help="override FUTBIN_RPS for this run (HTTP modes)")
+    parser.add_argument("--fresh", action="store_true", help="discard the log and checkpoint and start from page 1")
+    parser.add_argument("--incremental", action="store_true",
+                        help="refresh an existing catalog over HTTP, stopping at unchanged pages, and write a delta")
+    parser.add_argument("--report", default=None, help="where to write the JSON run report (default: scrape_reports/)")
+    args = parser.parse_args()
+    if args.rps is not None:
+        from futbin_cheapest import LIMITER
+        LIMITER.rate = args.rps
+
+    if args.incremental:
+        print("🔄 Incremental FUTBIN refresh starting...")
+        report = RunReport("futbin-incremental")
+        try:
+            asyncio.run(refresh_incremental(args.workers, report))
+        finally:
+            finish_report(report, args.report)
+        return
 
-        # Save after every page
-        with open(TEMP_FILE, "w", encoding="utf-8") as f:
-            json.dump(players, f, indent=2)
+    print("🔄 Resumable FUTBIN scraper starting...")
+    run = CatalogRun(fresh=args.fresh)
+    cp = run.checkpoint
+    print(f"📄 Resuming after page {cp['last_page']} (already have {run.count} players)")
+    if cp["skipped"]:
+        print(f"🔁 Retrying skipped pages first: {cp['skipped']}")
 
-        if new_players == 0:
-            print("⚠️ No new players found on this page. Might be done.")
-            break
+    report = RunReport(f"futbin-{args.mode}")
+    try:
+        if args.mode == "async":
+            asyncio.run(scrape_async(run, args.workers, report))
+        else:
+            scrape_selenium(run, report)
+    finally:
+        total = run.compact()
+        print(f"✅ Finished. Scraped {total} total players into {TEMP_FILE}.")
+        finish_report(report, args.report)
 
-        time.sleep(3)
 
-finally:
-    driver.quit()
-    print(f"✅ Finished. Scraped {len(players)} total players.")
+if __name__ == "__main__":
+    main()
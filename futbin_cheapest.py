@@ -1,10 +1,27 @@
 # futbin_cheapest.py
-import re, aiohttp, asyncio
+import os, re, time, aiohttp, asyncio
 from bs4 import BeautifulSoup
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; SBCSolver/1.5)"}
 SEM = asyncio.Semaphore(4)
 
+class RateLimiter:
+    """Spaces requests at most `rate` per second across every caller in the process (0 = off)."""
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next = 0.0
+
+    async def wait(self):
+        if self.rate <= 0: return
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+# every FUTBIN request (cheapest tables, catalog pages) goes through SEM and LIMITER
+LIMITER = RateLimiter(float(os.getenv("FUTBIN_RPS", "2")))
+
 def normalize_platform_key(platform: str) -> str:
     """
     Normalises platform strings to one of: ps, xbox, pc
@@ -33,8 +50,10 @@ def _plat_key(platform: str) -> str:
     return {"ps":"ps_price", "xbox":"xbox_price", "pc":"pc_price"}.get((platform or "ps").lower(), "ps_price")
 
 async def _scrape_players_table(session, url: str, plat_key: str, limit: int):
-    async with SEM, session.get(url, headers=HEADERS, timeout=25) as r:
-        html = await r.text()
+    async with SEM:
+        await LIMITER.wait()
+        async with session.get(url, headers=HEADERS, timeout=25) as r:
+            html = await r.text()
     soup = BeautifulSoup(html, "html.parser")
 
     # Map header names to indexes
@@ -86,3 +105,69 @@ async def futbin_cheapest_special(session: aiohttp.ClientSession, kind: str, min
     url = (f"https://www.futbin.com/players?version={version}"
            f"&player_rating={min_rating}-99&sort={plat_key}&order=asc&eUnt=1")
     return await _scrape_players_table(session, url, plat_key, limit)
+
+
+# ------------ Background sweep cache ------------
+
+PLATFORMS      = ("ps", "xbox", "pc")
+SWEEP_RATINGS  = range(75, 92)
+SWEEP_SPECIALS = ("totw", "tots")
+SPECIAL_MIN_RATING = 75
+
+class CheapestSweeper:
+    """
+    Keeps the latest cheapest-by-rating (and TOTW/TOTS special) tables for every platform.
+    Each sweep() refreshes at most `budget` tables, stalest first, so FUTBIN sees a bounded
+    number of requests per run; readers get the last good table and its age without waiting.
+    """
+    def __init__(self, ratings=SWEEP_RATINGS, specials=SWEEP_SPECIALS, platforms=PLATFORMS, budget: int = 20):
+        self.jobs = [(p, k) for p in platforms for k in (*ratings, *specials)]
+        self.budget = budget
+        self.tables = {}   # (platform, rating | special) -> {"rows": [...], "ts": float}
+        self.version = 0   # bumped whenever any table's rows change
+
+    async def _fetch(self, session, platform: str, key):
+        if isinstance(key, str):
+            return await futbin_cheapest_special(session, key, SPECIAL_MIN_RATING, platform)
+        return await futbin_cheapest_by_rating(session, key, platform)
+
+    def put(self, platform: str, key, rows) -> None:
+        old = self.tables.get((platform, key))
+        self.tables[(platform, key)] = {"rows": rows, "ts": time.time()}
+        if not old or old["rows"] != rows:
+            self.version += 1
+
+    async def sweep(self, session) -> int:
+        """Refresh the `budget` stalest tables; returns how many came back non-empty."""
+        stale = sorted(self.jobs, key=lambda j: self.tables.get(j, {}).get("ts", 0.0))[:self.budget]
+        async def one(job):
+            try:
+                rows = await self._fetch(session, *job)
+            except Exception:
+                return 0
+            if not rows:   # keep the last good table rather than a blocked/empty page
+                return 0
+            self.put(*job, rows)
+            return 1
+        return sum(await asyncio.gather(*(one(j) for j in stale)))
+
+    def get(self, platform: str, key):
+        """(rows, age_seconds) or None."""
+        hit = self.tables.get((normalize_platform_key(platform), key))
+        if not hit: return None
+        return hit["rows"], time.time() - hit["ts"]
+
+    def tables_for(self, platform: str, keys) -> dict:
+        """{key: rows} for the keys that have been swept."""
+        out = {}
+        for k in keys:
+            hit = self.get(platform, k)
+            if hit: out[k] = hit[0]
+        return out
+
+    def age(self, platform: str, keys) -> float | None:
+        """Age in seconds of the oldest swept table among `keys`."""
+        ages = [hit[1] for hit in (self.get(platform, k) for k in keys) if hit]
+        return max(ages) if ages else None
+
+SWEEPER = CheapestSweeper()
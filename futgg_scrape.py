@@ -1,10 +1,18 @@
 # futgg_scrape.py
-import re, json, asyncio, aiohttp
+import re, json, time, asyncio, inspect, aiohttp
 from bs4 import BeautifulSoup
 
+from sbc_cache import SBCCache, content_hash
+
 UA = {"User-Agent": "Mozilla/5.0 (compatible; FUTGG-SBCBot/2.5)"}
 SEM = asyncio.Semaphore(4)
 
+# SBC requirements and solution XIs rarely change; entries older than the TTL are
+# revalidated by page hash before anything is re-parsed.
+PARTS_TTL    = 6 * 3600
+SOLUTION_TTL = 24 * 3600
+CACHE = SBCCache()
+
 def _num(txt: str) -> int:
     if not txt: return 0
     t = txt.lower().replace(",", "").strip()
@@ -22,6 +30,31 @@ async def fetch_html(session: aiohttp.ClientSession, url: str) -> str:
         r.raise_for_status()
         return await r.text()
 
+async def _cached_scrape(session, kind: str, url: str, ttl: float, parse, force: bool = False):
+    """
+    Serve `kind` results for `url` from CACHE while younger than `ttl`.
+    Past the TTL the page is re-downloaded; if its hash is unchanged the stored result is
+    kept (and its TTL restarted) instead of re-parsing. Stale data is served if the fetch fails.
+    """
+    hit = CACHE.get(kind, url)
+    if hit and not force and hit[2] < ttl:
+        return hit[0]
+    try:
+        html = await fetch_html(session, url)
+    except Exception:
+        if hit: return hit[0]
+        raise
+    digest = content_hash(html)
+    if hit and hit[1] == digest:
+        CACHE.touch(kind, url)
+        return hit[0]
+    value = parse(html)
+    if inspect.isawaitable(value):
+        value = await value
+    if value:
+        CACHE.put(kind, url, digest, value)
+    return value
+
 def _extract_text_list(node) -> list[str]:
     out = []
     for li in node.find_all("li"):
@@ -40,126 +73,192 @@ def _extract_text_list(node) -> list[str]:
 
 # ------------ JSON scraping helpers ------------
 
+_DECODER = json.JSONDecoder()
+_NUXT_ASSIGN = re.compile(r"__NUXT__\s*=\s*\{")
+_MISS = object()
+
+def _decode_span(txt: str, start: int, end: int):
+    """
+    Parse txt[start:end] as one JSON value without slicing or regex backtracking.
+    Returns _MISS unless the value spans the whole range (same rule as json.loads on the slice).
+    """
+    if start < 0 or end <= start: return _MISS
+    i = start + 1
+    while i < end and txt[i] in " \t\n\r": i += 1
+    if i >= end or txt[i] not in '"}': return _MISS   # cannot be a JSON object
+    try:
+        obj, stop = _DECODER.raw_decode(txt, start)
+    except Exception:
+        return _MISS
+    return obj if stop == end else _MISS
+
 def _script_json_blobs(soup: BeautifulSoup) -> list[dict]:
-    blobs = []
-    # A) window.__NUXT__
+    """
+    One pass over <script> tags, classifying each by marker:
+      A) window.__NUXT__ = {...}
+      B) <script type="application/json">...</script>
+      C) last-ditch: the outermost {...} of any script
+    Blobs are returned grouped A, B, C (document order within each group); a span shared by
+    several groups is decoded once.
+    """
+    nuxt, typed, loose = [], [], []
     for s in soup.find_all("script"):
         txt = s.string or s.get_text() or ""
-        if "__NUXT__" in txt:
-            m = re.search(r"__NUXT__\s*=\s*(\{.*?\})\s*;?\s*$", txt, re.S)
-            if not m:
-                m = re.search(r"__NUXT__\s*=\s*(\{.*\})", txt, re.S)
-            if m:
-                raw = re.sub(r";\s*$", "", m.group(1))
-                try: blobs.append(json.loads(raw))
-                except: pass
-
-    # B) <script type="application/json">...</script>
-    for s in soup.find_all("script", attrs={"type": re.compile("json", re.I)}):
-        txt = (s.string or s.get_text() or "").strip()
         if not txt: continue
-        try: blobs.append(json.loads(txt))
-        except: pass
+        first, last = txt.find("{"), txt.rfind("}")
+        end = last + 1
+        loose_val = _decode_span(txt, first, end) if first != -1 else _MISS
 
-    # C) last-ditch: any {...} in scripts
-    for s in soup.find_all("script"):
-        txt = s.string or s.get_text() or ""
-        if not txt or "{" not in txt: continue
-        m = re.search(r"(\{.*\})", txt, re.S)
-        if not m: continue
-        candidate = re.sub(r";\s*$", "", m.group(1))
-        try:
-            blobs.append(json.loads(candidate))
-        except:
-            start, end = candidate.find("{"), candidate.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                try: blobs.append(json.loads(candidate[start:end+1]))
-                except: pass
-    return blobs
+        if "__NUXT__" in txt:
+            m = _NUXT_ASSIGN.search(txt)
+            if m:
+                at = m.end() - 1
+                val = loose_val if at == first else _decode_span(txt, at, end)
+                if val is not _MISS: nuxt.append(val)
+
+        if "json" in (s.get("type") or "").lower():
+            body = txt.strip()
+            if body:
+                if first != -1 and body[0] == "{" and body[-1] == "}" and not txt[:first].strip() and not txt[end:].strip():
+                    val = loose_val
+                else:
+                    try: val = json.loads(body)
+                    except Exception: val = _MISS
+                if val is not _MISS: typed.append(val)
+
+        if loose_val is not _MISS:
+            loose.append(loose_val)
+    return nuxt + typed + loose
 
 def _coerce_int(x):
     try: return int(x)
     except: return 0
 
-def _append_unique(players, name: str, rating: int, ps=0, xbox=0, pc=0):
-    if not name: return
+class _PlayerBag(list):
+    """Output list of player dicts plus a set of normalised names, so dedupe is O(1)."""
+    def __init__(self, limit: int = 11):
+        super().__init__()
+        self.seen = set()
+        self.limit = limit
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.limit
+
+def _append_unique(players: _PlayerBag, name: str, rating: int, ps=0, xbox=0, pc=0):
+    if not name or not isinstance(name, str): return
     key = name.strip().lower()
-    if any(p["name"].strip().lower() == key for p in players):
+    if key in players.seen:
         return
+    players.seen.add(key)
     players.append({"name": name.strip(), "rating": rating, "ps": ps, "xbox": xbox, "pc": pc})
 
-def _walk_for_players(node, out):
+def _name_of(d: dict):
+    return d.get("name") or d.get("fullName") or d.get("shortName")
+
+def _rating_of(d: dict):
+    return d.get("rating") or d.get("overall") or d.get("ovr") or 0
+
+def _append_with_price(out: _PlayerBag, pl: dict, holder: dict):
+    nm = _name_of(pl)
+    if not nm: return
+    pr = holder.get("price") or holder.get("prices") or {}
+    if not isinstance(pr, dict): pr = {}
+    ps = pr.get("ps") or pr.get("ps5") or pr.get("ps4") or 0
+    xb = pr.get("xbox") or pr.get("xb") or 0
+    pc = pr.get("pc") or pr.get("computer") or 0
+    _append_unique(out, nm, _coerce_int(_rating_of(pl)), _coerce_int(ps), _coerce_int(xb), _coerce_int(pc))
+
+def _take_players_list(items: list, out: _PlayerBag):
+    for obj in items:
+        if out.full: return
+        if not isinstance(obj, dict): continue
+        if "player" in obj and isinstance(obj["player"], dict):
+            _append_with_price(out, obj["player"], obj)
+        else:
+            nm = _name_of(obj)
+            if nm:
+                _append_unique(out, nm, _coerce_int(_rating_of(obj)))
+
+def _fast_players(node, out: _PlayerBag) -> bool:
+    """
+    Known layouts where the XI sits in the first "players" list we would reach anyway:
+      {"players": [...]}  (API responses)   and   {"squad": {"players": [...]}}
+    Returns True if that list alone filled `out`; otherwise `out` is left untouched.
+    """
+    for _ in range(3):
+        if not isinstance(node, dict) or isinstance(node.get("player"), dict):
+            return False
+        if isinstance(node.get("players"), list):
+            probe = _PlayerBag(out.limit)
+            _take_players_list(node["players"], probe)
+            if not probe.full: return False
+            for p in probe:
+                _append_unique(out, p["name"], p["rating"], p["ps"], p["xbox"], p["pc"])
+            return True
+        node = node.get("squad")
+    return False
+
+_FLAT = object()  # stack marker: run the flat name+rating check for the dict that follows
+MAX_WALK_NODES = 250_000
+
+def _walk_for_players(root, out: _PlayerBag, max_nodes: int = MAX_WALK_NODES):
     """
     Collect players from many likely shapes:
       - {"player": {...}, "price"/"prices": {...}}
       - {"players": [...]}
       - {"squad": [...] or {"players": [...]}}
       - flat {"name","rating/overall/ovr"}
+    Iterative pre-order walk (squad subtree first, then the node itself, then its values);
+    stops as soon as `out` is full or `max_nodes` containers have been visited.
     """
-    if isinstance(node, dict):
-        # explicit player + price
-        if "player" in node and isinstance(node["player"], dict):
-            pl = node["player"]
-            nm = pl.get("name") or pl.get("fullName") or pl.get("shortName")
-            rt = pl.get("rating") or pl.get("overall") or pl.get("ovr") or 0
-            pr = node.get("price") or node.get("prices") or {}
-            ps = pr.get("ps") or pr.get("ps5") or pr.get("ps4") or 0
-            xb = pr.get("xbox") or pr.get("xb") or 0
-            pc = pr.get("pc") or pr.get("computer") or 0
+    if out.full or _fast_players(root, out):
+        return
+    if type(root) is not dict and type(root) is not list:
+        return
+    stack = [root]
+    while stack and not out.full and max_nodes > 0:
+        node = stack.pop()
+        if node is _FLAT:
+            node = stack.pop()
+            nm = _name_of(node)
             if nm:
-                _append_unique(out, nm, _coerce_int(rt), _coerce_int(ps), _coerce_int(xb), _coerce_int(pc))
-
-        # players list
+                _append_unique(out, nm, _coerce_int(_rating_of(node)))
+            continue
+        max_nodes -= 1
+        if type(node) is list:
+            kids = [v for v in node if type(v) is dict or type(v) is list]
+            kids.reverse()
+            stack.extend(kids)
+            continue
+        if "player" in node and isinstance(node["player"], dict):
+            _append_with_price(out, node["player"], node)
         if "players" in node and isinstance(node["players"], list):
-            for obj in node["players"]:
-                if isinstance(obj, dict):
-                    if "player" in obj and isinstance(obj["player"], dict):
-                        pl = obj["player"]
-                        nm = pl.get("name") or pl.get("fullName") or pl.get("shortName")
-                        rt = pl.get("rating") or pl.get("overall") or pl.get("ovr") or 0
-                        pr = obj.get("price") or obj.get("prices") or {}
-                        ps = pr.get("ps") or pr.get("ps5") or pr.get("ps4") or 0
-                        xb = pr.get("xbox") or pr.get("xb") or 0
-                        pc = pr.get("pc") or pr.get("computer") or 0
-                        if nm:
-                            _append_unique(out, nm, _coerce_int(rt), _coerce_int(ps), _coerce_int(xb), _coerce_int(pc))
-                    else:
-                        nm = obj.get("name") or obj.get("fullName") or obj.get("shortName")
-                        rt = obj.get("rating") or obj.get("overall") or obj.get("ovr") or 0
-                        if nm:
-                            _append_unique(out, nm, _coerce_int(rt))
-
-        # squad container
-        if "squad" in node:
-            sq = node["squad"]
-            if isinstance(sq, list):
-                for obj in sq: _walk_for_players(obj, out)
-            elif isinstance(sq, dict):
-                _walk_for_players(sq, out)
-
-        # flat object with name+rating
-        if "name" in node and any(k in node for k in ("rating","overall","ovr")):
-            nm = node.get("name") or node.get("fullName") or node.get("shortName")
-            rt = node.get("rating") or node.get("overall") or node.get("ovr") or 0
-            if nm:
-                _append_unique(out, nm, _coerce_int(rt))
-
-        for v in node.values():
-            _walk_for_players(v, out)
-
-    elif isinstance(node, list):
-        for v in node:
-            _walk_for_players(v, out)
+            _take_players_list(node["players"], out)
+        # the squad subtree is walked first, so skip it when queuing the remaining values
+        sq = node.get("squad")
+        if type(sq) is not dict and type(sq) is not list: sq = None
+        kids = [v for v in node.values() if (type(v) is dict or type(v) is list) and v is not sq]
+        kids.reverse()
+        stack.extend(kids)
+        if "name" in node and ("rating" in node or "overall" in node or "ovr" in node):
+            stack.append(node); stack.append(_FLAT)
+        if type(sq) is list:
+            kids = [v for v in sq if type(v) is dict or type(v) is list]
+            kids.reverse()
+            stack.extend(kids)
+        elif sq is not None:
+            stack.append(sq)
 
 def _players_from_json_blobs(blobs: list[dict]) -> list[dict]:
-    players = []
+    players = _PlayerBag()
     for b in blobs:
         _walk_for_players(b, players)
-        if len(players) >= 11: break
+        if players.full: break
     return players[:11]
 
 def _players_from_dom(soup: BeautifulSoup) -> list[dict]:
-    players = []
+    players = _PlayerBag()
     for row in soup.select("table tbody tr"):
         tds = row.select("td")
         if len(tds) < 2: continue
@@ -178,7 +277,7 @@ def _players_from_dom(soup: BeautifulSoup) -> list[dict]:
 
 def _players_from_raw_regex(html: str) -> list[dict]:
     # Find "name":"..."{<=150 chars}"rating|overall|ovr":<num>
-    players = []
+    players = _PlayerBag()
     pat = re.compile(r'"name"\s*:\s*"([^"]{2,})"[^}{]{0,150}?"(?:rating|overall|ovr)"\s*:\s*(\d{2,3})', re.I|re.S)
     for m in pat.finditer(html):
         nm = m.group(1).strip()
@@ -186,7 +285,7 @@ def _players_from_raw_regex(html: str) -> list[dict]:
         if nm:
             _append_unique(players, nm, rt)
             if len(players) >= 11: break
-    return players
+    return players[:11]
 
 # ------------ Public: SBC parts + solution XI ------------
 
@@ -206,8 +305,10 @@ def _closest_part_container(a):
             return cur, title
     return None, None
 
-async def futgg_fetch_sbc_parts(session: aiohttp.ClientSession, sbc_url: str):
-    html = await fetch_html(session, sbc_url)
+async def futgg_fetch_sbc_parts(session: aiohttp.ClientSession, sbc_url: str, force: bool = False):
+    return await _cached_scrape(session, "parts", sbc_url, PARTS_TTL, _sbc_parts_from_html, force)
+
+def _sbc_parts_from_html(html: str) -> list[dict]:
     soup = BeautifulSoup(html, "html.parser")
     parts = []
 
@@ -260,29 +361,40 @@ async def futgg_fetch_sbc_parts(session: aiohttp.ClientSession, sbc_url: str):
             uniq = [{"title": "Requirements", "cost": 0, "requirements": raw, "solution_url": None}]
     return uniq
 
-async def futgg_fetch_solution_players(session: aiohttp.ClientSession, solution_url: str):
+async def futgg_fetch_solution_players(session: aiohttp.ClientSession, solution_url: str, force: bool = False):
     """
     Returns up to 11 dicts:
       {"name": str, "rating": int, "ps": int, "xbox": int, "pc": int}
-    Strategy:
-      1) inline JSON blobs (Nuxt etc.)
-      2) Nuxt data JSON (link rel=preload as=fetch)
-      3) API guesses by UUID (/api/squad-builder/<uuid>, /api/squad/<uuid>)
-      4) raw regex on HTML
-      5) DOM fallback
+    Strategies (see SOLUTION_STRATEGIES), tried cheapest-expected-first per STRATEGY_STATS:
+      - inline JSON blobs (Nuxt etc.)
+      - Nuxt data JSON (link rel=preload as=fetch)
+      - API guesses by UUID (/api/squad-builder/<uuid>, /api/squad/<uuid>)
+    then the fallbacks, always in this order:
+      - raw regex on HTML
+      - DOM fallback
+    Results are cached per URL (see _cached_scrape).
     """
-    html = await fetch_html(session, solution_url)
-    soup = BeautifulSoup(html, "html.parser")
+    async def parse(html):
+        return await _solution_players_from_html(session, solution_url, html)
+    return await _cached_scrape(session, "solution", solution_url, SOLUTION_TTL, parse, force)
 
-    # 1) Inline JSON blobs
-    blobs = _script_json_blobs(soup)
-    players = _players_from_json_blobs(blobs)
-    if players:
-        return players[:11]
+class _SolveCtx:
+    def __init__(self, session: aiohttp.ClientSession, solution_url: str, html: str):
+        self.session, self.solution_url, self.html = session, solution_url, html
+        self._soup = None
 
-    # 2) Nuxt data JSON (preload fetch)
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+async def _strategy_inline_json(ctx: _SolveCtx) -> list[dict]:
+    return _players_from_json_blobs(_script_json_blobs(ctx.soup))
+
+async def _strategy_nuxt_data(ctx: _SolveCtx) -> list[dict]:
     data_href = None
-    for ln in soup.find_all("link"):
+    for ln in ctx.soup.find_all("link"):
         rel = (ln.get("rel") or [])
         as_attr = (ln.get("as") or "").lower()
         href = ln.get("href") or ""
@@ -290,72 +402,151 @@ async def futgg_fetch_solution_players(session: aiohttp.ClientSession, solution_
             data_href = href
             break
     if not data_href:
-        m = re.search(r'/_nuxt/data/[^"\']+squad-builder[^"\']+\.json', html)
+        m = re.search(r'/_nuxt/data/[^"\']+squad-builder[^"\']+\.json', ctx.html)
         if m:
             data_href = m.group(0)
+    if not data_href:
+        return []
+
+    data_url = data_href if data_href.startswith("http") else f"https://www.fut.gg{data_href}"
+    headers = {**UA, "Referer": ctx.solution_url, "Accept": "application/json, text/plain, */*"}
+    async with SEM, ctx.session.get(data_url, headers=headers, timeout=25) as r:
+        txt = await r.text()
+    try:
+        nuxt_json = json.loads(txt)
+    except Exception:
+        return []
+    pl = _players_from_json_blobs([nuxt_json]) if nuxt_json else []
+    if not pl and isinstance(nuxt_json, dict):
+        for v in nuxt_json.values():
+            if isinstance(v, (dict, list)):
+                pl = _players_from_json_blobs([v])
+                if pl:
+                    break
+    return pl
+
+API_SHAPES = [
+    "https://www.fut.gg/api/squad-builder/{uuid}",
+    "https://www.fut.gg/api/squad/{uuid}",
+    "https://www.fut.gg/api/squad-builder/{uuid}/players",
+]
+
+def _players_from_api(data) -> list[dict]:
+    players = []
+    if isinstance(data, dict):
+        if "players" in data and isinstance(data["players"], list):
+            for p in data["players"]:
+                if not isinstance(p, dict): continue
+                name = p.get("name") or p.get("fullName")
+                rating = p.get("rating") or p.get("overall") or 0
+                ps = p.get("ps") or p.get("ps5") or 0
+                xbox = p.get("xbox") or 0
+                pc = p.get("pc") or 0
+                if name:
+                    players.append({"name": name, "rating": _coerce_int(rating), "ps": ps, "xbox": xbox, "pc": pc})
+        elif "squad" in data:
+            return _players_from_json_blobs([data])
+    return players
 
-    if data_href:
-        data_url = data_href if data_href.startswith("http") else f"https://www.fut.gg{data_href}"
-        headers = {**UA, "Referer": solution_url, "Accept": "application/json, text/plain, */*"}
-        async with SEM, session.get(data_url, headers=headers, timeout=25) as r:
-            txt = await r.text()
+async def _strategy_api(ctx: _SolveCtx) -> list[dict]:
+    m_uuid = re.search(r'/squad-builder/([0-9a-fA-F-]{8,})', ctx.solution_url)
+    if not m_uuid:
+        return []
+    uuid = m_uuid.group(1).strip("/")
+    headers = {**UA, "Referer": ctx.solution_url, "Accept": "application/json"}
+    # the shape that answered last time goes first; the others are only guessed if it stops working
+    order = sorted(range(len(API_SHAPES)), key=lambda i: i != STRATEGY_STATS.api_shape)
+    for i in order:
+        api = API_SHAPES[i].format(uuid=uuid)
+        try:
+            async with SEM, ctx.session.get(api, headers=headers, timeout=20) as r:
+                if r.status != 200:
+                    continue
+                txt = await r.text()
+            data = json.loads(txt)
+        except Exception:
+            continue
+        players = _players_from_api(data)
+        if players:
+            STRATEGY_STATS.api_shape = i
+            return players
+    STRATEGY_STATS.api_shape = None
+    return []
+
+async def _strategy_raw_regex(ctx: _SolveCtx) -> list[dict]:
+    return _players_from_raw_regex(ctx.html)
+
+async def _strategy_dom(ctx: _SolveCtx) -> list[dict]:
+    return _players_from_dom(ctx.soup)
+
+# (name, strategy, prior cost in seconds); list order is the tie-break order.
+# The precise strategies are reordered adaptively; the lossy fallbacks (no prices, may
+# pick up stray names) always run last and in this order.
+SOLUTION_STRATEGIES = [
+    ("inline_json", _strategy_inline_json, 0.05),
+    ("nuxt_data",   _strategy_nuxt_data,   0.50),
+    ("api",         _strategy_api,         0.80),
+]
+SOLUTION_FALLBACKS = [
+    ("raw_regex",   _strategy_raw_regex,   0.02),
+    ("dom",         _strategy_dom,         0.05),
+]
+
+class StrategyStats:
+    """
+    Per-strategy attempts, hits and cumulative cost for futgg_fetch_solution_players.
+    Strategies are tried in order of expected cost-to-success: mean cost / hit rate, with
+    both smoothed towards the priors so a strategy is never written off after a few misses.
+    """
+    def __init__(self, strategies):
+        self.priors = {name: cost for name, _, cost in strategies}
+        self.stats = {name: {"tries": 0, "hits": 0, "cost": 0.0} for name, _, _ in strategies}
+        self.api_shape = None  # index into API_SHAPES that last returned players
+
+    def record(self, name: str, hit: bool, cost: float):
+        st = self.stats[name]
+        st["tries"] += 1
+        st["hits"] += 1 if hit else 0
+        st["cost"] += cost
+
+    def hit_rate(self, name: str) -> float:
+        st = self.stats[name]
+        return (st["hits"] + 1) / (st["tries"] + 2)
+
+    def mean_cost(self, name: str) -> float:
+        st = self.stats[name]
+        return (st["cost"] + self.priors[name]) / (st["tries"] + 1)
+
+    def expected_cost(self, name: str) -> float:
+        return self.mean_cost(name) / self.hit_rate(name)
+
+    def order(self, strategies):
+        ranked = sorted(enumerate(strategies), key=lambda x: (self.expected_cost(x[1][0]), x[0]))
+        return [s for _, s in ranked]
+
+    def snapshot(self) -> list[dict]:
+        out = []
+        for name in self.stats:
+            st = self.stats[name]
+            out.append({
+                "name": name, "tries": st["tries"], "hits": st["hits"],
+                "hit_rate": self.hit_rate(name), "mean_cost": self.mean_cost(name),
+                "expected_cost": self.expected_cost(name),
+            })
+        out.sort(key=lambda x: x["expected_cost"])
+        return out
+
+STRATEGY_STATS = StrategyStats(SOLUTION_STRATEGIES + SOLUTION_FALLBACKS)
+
+async def _solution_players_from_html(session: aiohttp.ClientSession, solution_url: str, html: str) -> list[dict]:
+    ctx = _SolveCtx(session, solution_url, html)
+    for name, strategy, _ in STRATEGY_STATS.order(SOLUTION_STRATEGIES) + SOLUTION_FALLBACKS:
+        t0 = time.perf_counter()
         try:
-            nuxt_json = json.loads(txt)
+            players = await strategy(ctx)
         except Exception:
-            nuxt_json = None
-        if nuxt_json:
-            pl = _players_from_json_blobs([nuxt_json])
-            if not pl and isinstance(nuxt_json, dict):
-                for v in nuxt_json.values():
-                    if isinstance(v, (dict, list)):
-                        pl = _players_from_json_blobs([v])
-                        if pl:
-                            break
-            if pl:
-                return pl[:11]
-
-        # 3) API guesses by UUID
-    m_uuid = re.search(r'/squad-builder/([0-9a-fA-F-]{8,})', solution_url)
-    if m_uuid:
-        uuid = m_uuid.group(1).strip("/")
-        api_candidates = [
-            f"https://www.fut.gg/api/squad-builder/{uuid}",
-            f"https://www.fut.gg/api/squad/{uuid}",
-            f"https://www.fut.gg/api/squad-builder/{uuid}/players",
-        ]
-        headers = {**UA, "Referer": solution_url, "Accept": "application/json"}
-        for api in api_candidates:
-            try:
-                async with SEM, session.get(api, headers=headers, timeout=20) as r:
-                    if r.status != 200:
-                        continue
-                    txt = await r.text()
-                data = json.loads(txt)
-            except Exception:
-                continue
-
-            # look for players directly
             players = []
-            if isinstance(data, dict):
-                if "players" in data and isinstance(data["players"], list):
-                    for p in data["players"]:
-                        name = p.get("name") or p.get("fullName")
-                        rating = p.get("rating") or p.get("overall") or 0
-                        ps = p.get("ps") or p.get("ps5") or 0
-                        xbox = p.get("xbox") or 0
-                        pc = p.get("pc") or 0
-                        if name:
-                            players.append({"name": name, "rating": int(rating), "ps": ps, "xbox": xbox, "pc": pc})
-                elif "squad" in data:
-                    return _players_from_json_blobs([data])
-
-            if players:
-                return players[:11]
-
-    # 4) raw regex over HTML
-    players = _players_from_raw_regex(html)
-    if players:
-        return players[:11]
-
-    # 5) DOM fallback
-    return _players_from_dom(soup)[:11]
\ No newline at end of file
+        STRATEGY_STATS.record(name, bool(players), time.perf_counter() - t0)
+        if players:
+            return players[:11]
+    return []
@@ -1,12 +1,154 @@
+import os
+import re
 import json
 import time
-import undetected_chromedriver as uc
+import asyncio
+import argparse
 from bs4 import BeautifulSoup
 
-def scrape_futgg_players():
-    base_url = "https://www.fut.gg/players/"
-    players_data = []
-    page = 1
+from catalog_delta import write_json_atomic
+from scrape_report import RunReport
+
+BASE_URL = "https://www.fut.gg/players/"
+OUT_FILE = "futgg_players.json"
+LOG_FILE = "futgg_players.jsonl"
+CHECKPOINT_FILE = "futgg_checkpoint.json"
+MAX_PAGES = 1000
+WINDOW = 8  # pages requested per batch; futgg_scrape.SEM bounds how many are in flight
+RETRIES = 2  # extra attempts for a page that hits 429/5xx or a connection error
+
+# a card link is /players/<player id>-<slug>/<year>-<card id>/; nav links (/players/new/, ...) aren't
+CARD_HREF = re.compile(r"^/players/\d+-[^/]+/\d+-\d+/?$")
+
+
+def parse_cards(html):
+    """Cards on one listing page, one entry per card URL."""
+    soup = BeautifulSoup(html, "html.parser")
+    out, seen = [], set()
+    for card in soup.select("a[href^='/players/']"):
+        href = card.get("href") or ""
+        if not CARD_HREF.match(href) or href in seen:
+            continue
+        img = card.select_one("img")
+        alt_text = img.get("alt") if img else None
+        if not alt_text:
+            continue
+
+        parts = [part.strip() for part in alt_text.split(" - ")]
+        if len(parts) < 3:
+            continue
+
+        seen.add(href)
+        out.append({
+            "name": parts[0],
+            "rating": parts[1],
+            "card_type": parts[2],
+            "url": "https://www.fut.gg" + href
+        })
+    return out
+
+
+class CardLog:
+    """
+    Streaming output: cards are appended to LOG_FILE as each page completes, the last completed
+    page goes to CHECKPOINT_FILE, and compact() writes OUT_FILE once at the end.
+    """
+    def __init__(self, fresh=False):
+        if fresh:
+            for path in (LOG_FILE, CHECKPOINT_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
+        self.seen_urls = set()
+        if os.path.exists(LOG_FILE):
+            # drop a line torn by a crash mid-write
+            with open(LOG_FILE, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    f.truncate(data.rfind(b"\n") + 1)
+            with open(LOG_FILE, "r", encoding="utf-8") as f:
+                for line in f:
+                    self.seen_urls.add(json.loads(line)["url"])
+        try:
+            with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+                self.last_page = json.load(f)["last_page"]
+        except (OSError, json.JSONDecodeError, KeyError):
+            self.last_page = 0
+        self._log = open(LOG_FILE, "a", encoding="utf-8")
+
+    def page_done(self, page, cards):
+        new = 0
+        for c in cards:
+            if c["url"] in self.seen_urls:
+                continue
+            self._log.write(json.dumps(c, ensure_ascii=False) + "\n")
+            self.seen_urls.add(c["url"])
+            new += 1
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.last_page = page
+        write_json_atomic(CHECKPOINT_FILE, {"last_page": page})
+        return new
+
+    def compact(self):
+        self._log.close()
+        with open(LOG_FILE, "r", encoding="utf-8") as f:
+            players = [json.loads(line) for line in f]
+        with open(OUT_FILE + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(players, f, indent=2, ensure_ascii=False)
+        os.replace(OUT_FILE + ".tmp", OUT_FILE)
+        return len(players)
+
+
+async def scrape_async(log, report):
+    """Listing pages WINDOW at a time over one session; stops at the first empty or failed page."""
+    import aiohttp
+    from futgg_scrape import SEM, UA
+
+    async def page(session, n):
+        for attempt in range(RETRIES + 1):
+            if attempt:
+                report.retry(n)
+                with report.timed(n, "wait"):
+                    await asyncio.sleep(2 ** attempt)
+            with report.timed(n, "wait"):
+                await SEM.acquire()
+            try:
+                with report.timed(n, "fetch"):
+                    async with session.get(f"{BASE_URL}?page={n}", headers=UA, timeout=30) as r:
+                        status = r.status
+                        html = await r.text() if status == 200 else None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            finally:
+                SEM.release()
+            # connection errors (status is the exception name), throttling and 5xx are worth another go
+            if status == 200 or not (isinstance(status, str) or status in (429, 500, 502, 503, 504)):
+                break
+        if status != 200:
+            print(f"⚠️ Page {n} failed: {status}")
+            report.block(n, status)
+            return None
+        with report.timed(n, "parse"):
+            return parse_cards(html)
+
+    async with aiohttp.ClientSession() as session:
+        for first in range(log.last_page + 1, MAX_PAGES, WINDOW):
+            nums = range(first, min(first + WINDOW, MAX_PAGES))
+            results = await asyncio.gather(*(page(session, n) for n in nums))
+            for n, cards in zip(nums, results):
+                if not cards:
+                    # pages after a failure are refetched next run, so the checkpoint stays exact
+                    if cards is not None:
+                        print(f"🏁 No cards on page {n} — done.")
+                    return
+                with report.timed(n, "write"):
+                    new = log.page_done(n, cards)
+                print(f"🔎 Page {n}: {len(cards)} cards, {new} new")
+            print(f"📊 {report.summary()['pages_per_sec']:.2f} pages/sec · {len(log.seen_urls)} cards")
+
+
+def scrape_selenium(log, report):
+    import undetected_chromedriver as uc
 
     options = uc.ChromeOptions()
     options.add_argument("--headless=new")
@@ -16,53 +158,45 @@ def scrape_futgg_players():
     driver = uc.Chrome(options=options)
 
     try:
-        while True:
+        for page in range(log.last_page + 1, MAX_PAGES):
             print(f"🔎 Scraping page {page}...")
-            driver.get(f"{base_url}?page={page}")
-            time.sleep(2)
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            cards = soup.select("a[href^='/players/']")
+            with report.timed(page, "fetch"):
+                driver.get(f"{BASE_URL}?page={page}")
+            with report.timed(page, "wait"):
+                time.sleep(2)
 
+            with report.timed(page, "parse"):
+                cards = parse_cards(driver.page_source)
             if not cards:
                 break
-
-            for card in cards:
-                try:
-                    img = card.select_one("img")
-                    alt_text = img["alt"] if img and "alt" in img.attrs else None
-                    if not alt_text:
-                        continue
-
-                    parts = [part.strip() for part in alt_text.split(" - ")]
-                    if len(parts) < 3:
-                        continue
-
-                    name = parts[0]
-                    rating = parts[1]
-                    card_type = parts[2]
-                    full_url = "https://www.fut.gg" + card["href"]
-
-                    players_data.append({
-                        "name": name,
-                        "rating": rating,
-                        "card_type": card_type,
-                        "url": full_url
-                    })
-                except Exception as e:
-                    print(f"❌ Error parsing player: {e}")
-                    continue
-
-            page += 1
-            time.sleep(1)
-
+            with report.timed(page, "write"):
+                new = log.page_done(page, cards)
+            print(f"✅ {len(cards)} cards, {new} new")
     finally:
         driver.quit()
 
-    with open("futgg_players.json", "w", encoding="utf-8") as f:
-        json.dump(players_data, f, indent=2, ensure_ascii=False)
 
-    print(f"✅ Scraped {len(players_data)} players.")
+def scrape_futgg_players(mode="async", fresh=False, report_path=None):
+    log = CardLog(fresh=fresh)
+    if log.last_page:
+        print(f"📄 Resuming after page {log.last_page} ({len(log.seen_urls)} cards so far)")
+    report = RunReport(f"futgg-{mode}")
+    try:
+        if mode == "async":
+            asyncio.run(scrape_async(log, report))
+        else:
+            scrape_selenium(log, report)
+    finally:
+        total = log.compact()
+        print(f"✅ Scraped {total} players.")
+        report.print_summary()
+        print(f"🧾 Run report: {report.write(report_path)}")
+
 
 if __name__ == "__main__":
-    scrape_futgg_players()
+    parser = argparse.ArgumentParser(description="Scrape the FUT.GG player list into " + OUT_FILE)
+    parser.add_argument("--mode", choices=("async", "selenium"), default="async")
+    parser.add_argument("--fresh", action="store_true", help="discard the log and checkpoint and start from page 1")
+    parser.add_argument("--report", default=None, help="where to write the JSON run report (default: scrape_reports/)")
+    args = parser.parse_args()
+    scrape_futgg_players(args.mode, args.fresh, args.report)
@@ -0,0 +1,177 @@
+# portfolio_db.py
+import re
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+import asyncpg
+
+# Storage for cogs/portfolio.py. DATABASE_URL=postgres://... gives an asyncpg pool;
+# DATABASE_URL=sqlite:///portfolio.db (or sqlite:///:memory:) gives SQLitePool, a stand-in
+# with the slice of asyncpg's pool/connection API the portfolio code uses. Both run the
+# same query text: $n placeholders bind natively in SQLite, and the only Postgres-isms
+# the portfolio queries use (casts, ILIKE, FOR UPDATE) are rewritten by _translate().
+
+SQLITE_PREFIX = "sqlite://"
+_CASTS = {"text": "TEXT", "bigint": "INTEGER", "int": "INTEGER", "integer": "INTEGER",
+          "float8": "REAL", "numeric": "REAL"}
+_CAST = re.compile(r"(\$\d+|\b[\w.]+)::(\w+)")
+
+def _adapt_datetime(dt: datetime) -> str:
+    # one fixed-width UTC format, so timestamps compare correctly as text
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def _convert_timestamp(raw: bytes) -> datetime:
+    return datetime.fromisoformat(raw.decode()).replace(tzinfo=timezone.utc)
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_converter("TIMESTAMPTZ", _convert_timestamp)
+
+def _translate(sql: str) -> str:
+    sql = _CAST.sub(lambda m: f"CAST({m.group(1)} AS {_CASTS.get(m.group(2).lower(), m.group(2))})", sql)
+    sql = re.sub(r"\bILIKE\b", "LIKE", sql)  # SQLite's LIKE is already case-insensitive (ASCII)
+    sql = re.sub(r"\s+FOR UPDATE\b", "", sql)  # one writer at a time anyway
+    return sql
+
+def _params(args) -> dict:
+    return {str(i): v for i, v in enumerate(args, start=1)}
+
+def _status(sql: str, rowcount: int) -> str:
+    # what asyncpg's execute() returns, e.g. "INSERT 0 3" / "UPDATE 2" / "DELETE 0"
+    verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    if verb == "INSERT":
+        return f"INSERT 0 {max(rowcount, 0)}"
+    if verb in ("UPDATE", "DELETE"):
+        return f"{verb} {max(rowcount, 0)}"
+    return verb
+
+# The schema MIGRATIONS ends up with, in SQLite types (no sequences, INCLUDE or CONCURRENTLY).
+SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS portfolio (
+        user_id TEXT PRIMARY KEY,
+        starting_balance INTEGER DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT,
+        player TEXT,
+        version TEXT,
+        buy INTEGER,
+        sell INTEGER,
+        quantity INTEGER,
+        platform TEXT,
+        tag TEXT,
+        notes TEXT,
+        ea_tax INTEGER,
+        profit INTEGER,
+        timestamp TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS trades_user_ts_cover
+        ON trades (user_id, timestamp, player, quantity, buy, sell, profit, ea_tax);
+    CREATE TABLE IF NOT EXISTS positions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        player TEXT NOT NULL,
+        card_id TEXT,
+        version TEXT,
+        buy INTEGER NOT NULL,
+        quantity INTEGER NOT NULL CHECK (quantity > 0),
+        platform TEXT NOT NULL,
+        tag TEXT,
+        notes TEXT,
+        opened_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS positions_user ON positions (user_id);
+    CREATE TABLE IF NOT EXISTS guild_traders (
+        guild_id TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        PRIMARY KEY (guild_id, user_id)
+    );
+"""
+
+class SQLiteConnection:
+    """The asyncpg.Connection methods the portfolio code calls, over one sqlite3 connection."""
+    dialect = "sqlite"
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+        self._depth = 0
+
+    async def execute(self, sql: str, *args) -> str:
+        if not args and ";" in sql.strip().rstrip(";"):
+            # multi-statement DDL, as asyncpg allows without args (executescript would COMMIT)
+            for stmt in filter(str.strip, sql.split(";")):
+                self._db.execute(_translate(stmt))
+            return _status(sql, -1)
+        cur = self._db.execute(_translate(sql), _params(args))
+        return _status(sql, cur.rowcount)
+
+    async def executemany(self, sql: str, args) -> None:
+        self._db.executemany(_translate(sql), [_params(a) for a in args])
+
+    async def fetch(self, sql: str, *args) -> list:
+        return self._db.execute(_translate(sql), _params(args)).fetchall()
+
+    async def fetchrow(self, sql: str, *args):
+        return self._db.execute(_translate(sql), _params(args)).fetchone()
+
+    async def fetchval(self, sql: str, *args):
+        row = await self.fetchrow(sql, *args)
+        return row[0] if row is not None else None
+
+    async def copy_records_to_table(self, table: str, *, records, columns) -> str:
+        cols = ", ".join(columns)
+        marks = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+        cur = self._db.executemany(f"INSERT INTO {table} ({cols}) VALUES ({marks})", [_params(r) for r in records])
+        return f"COPY {cur.rowcount}"
+
+    @asynccontextmanager
+    async def transaction(self):
+        # outermost block is BEGIN/COMMIT, nested ones are savepoints (as in asyncpg)
+        name = f"sp{self._depth}"
+        self._db.execute("BEGIN" if self._depth == 0 else f"SAVEPOINT {name}")
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            self._depth -= 1
+            self._db.execute("ROLLBACK" if self._depth == 0 else f"ROLLBACK TO {name}")
+            if self._depth: self._db.execute(f"RELEASE {name}")
+            raise
+        else:
+            self._depth -= 1
+            self._db.execute("COMMIT" if self._depth == 0 else f"RELEASE {name}")
+
+class SQLitePool:
+    """
+    asyncpg.Pool stand-in: acquire() hands out the single connection to one task at a time,
+    which is also SQLite's own single-writer model.
+    """
+    dialect = "sqlite"
+
+    def __init__(self, path: str):
+        db = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                             detect_types=sqlite3.PARSE_DECLTYPES)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        self._conn = SQLiteConnection(db)
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self._lock:
+            yield self._conn
+
+    async def close(self) -> None:
+        self._conn._db.close()
+
+async def create_pool(url: Optional[str]):
+    """asyncpg pool for a postgres:// URL, SQLitePool for sqlite:///path."""
+    if url and url.startswith(SQLITE_PREFIX):
+        return SQLitePool(url[len(SQLITE_PREFIX) + 1:])  # sqlite:///rel.db, sqlite:////abs.db
+    return await asyncpg.create_pool(url)
@@ -0,0 +1,235 @@
+# portfolio_migrations.py
+import asyncio
+from typing import Awaitable, Callable, List, Tuple
+
+import portfolio_stats
+
+# Postgres schema for cogs/portfolio.py, applied in order and recorded in schema_migrations.
+# Every step is safe to re-run: a crash mid-backfill resumes where it stopped. Long work
+# (backfills, index builds) runs in short autocommitted batches or CONCURRENTLY, so the
+# trades table is never held under a long lock while the bot keeps logging trades.
+
+BACKFILL_BATCH = 5000
+LOCK_ID = 715_245_001  # pg_advisory_lock key: one migrator at a time across bot instances
+
+async def _column_type(conn, table: str, column: str):
+    return await conn.fetchval("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = $1 AND column_name = $2
+    """, table, column)
+
+async def _backfill(conn, sql: str) -> int:
+    """Run a `... LIMIT n` batch UPDATE until it stops touching rows; each batch commits alone."""
+    total = 0
+    while True:
+        status = await conn.execute(sql, BACKFILL_BATCH)
+        n = int(status.split()[-1])
+        total += n
+        if n < BACKFILL_BATCH:
+            return total
+        await asyncio.sleep(0)
+
+async def _create_index_concurrently(conn, name: str, ddl: str):
+    # a failed CONCURRENTLY build leaves an INVALID index behind; drop it and build again
+    valid = await conn.fetchval("""
+        SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = $1
+    """, name)
+    if valid is False:
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    await conn.execute(ddl)
+
+async def m001_base(conn):
+    """The original schema, so fresh databases and old deployments start from the same place."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS portfolio (
+            user_id TEXT PRIMARY KEY,
+            starting_balance INTEGER DEFAULT 0
+        )
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS trades (
+            user_id TEXT,
+            player TEXT,
+            version TEXT,
+            buy INTEGER,
+            sell INTEGER,
+            quantity INTEGER,
+            platform TEXT,
+            tag TEXT,
+            notes TEXT,
+            ea_tax INTEGER,
+            profit INTEGER,
+            timestamp TEXT
+        )
+    """)
+
+async def m002_trade_id(conn):
+    """
+    Surrogate key. The column and its sequence default are metadata-only changes; existing
+    rows get ids in batches, then NOT NULL is proven by a NOT VALID check validated without
+    blocking writes, and the primary key is attached to an index built CONCURRENTLY.
+    """
+    await conn.execute("CREATE SEQUENCE IF NOT EXISTS trades_id_seq")
+    await conn.execute("ALTER TABLE trades ADD COLUMN IF NOT EXISTS id BIGINT")
+    await conn.execute("ALTER TABLE trades ALTER COLUMN id SET DEFAULT nextval('trades_id_seq')")
+    await conn.execute("ALTER SEQUENCE trades_id_seq OWNED BY trades.id")
+    await _backfill(conn, """
+        UPDATE trades SET id = nextval('trades_id_seq')
+        WHERE ctid IN (SELECT ctid FROM trades WHERE id IS NULL LIMIT $1)
+    """)
+    has_pk = await conn.fetchval("""
+        SELECT 1 FROM pg_constraint WHERE conrelid = 'trades'::regclass AND contype = 'p'
+    """)
+    if has_pk:
+        return
+    await conn.execute("""
+        DO $$ BEGIN
+            ALTER TABLE trades ADD CONSTRAINT trades_id_not_null CHECK (id IS NOT NULL) NOT VALID;
+        EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """)
+    await conn.execute("ALTER TABLE trades VALIDATE CONSTRAINT trades_id_not_null")
+    await conn.execute("ALTER TABLE trades ALTER COLUMN id SET NOT NULL")  # no scan: the check proves it
+    await conn.execute("ALTER TABLE trades DROP CONSTRAINT trades_id_not_null")
+    await _create_index_concurrently(conn, "trades_id_key",
+                                     "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS trades_id_key ON trades (id)")
+    await conn.execute("ALTER TABLE trades ADD CONSTRAINT trades_pkey PRIMARY KEY USING INDEX trades_id_key")
+
+async def m003_timestamptz(conn):
+    """
+    TEXT isoformat timestamps (naive UTC from datetime.utcnow) -> timestamptz. A new column is
+    backfilled in id ranges; the swap (catch-up of rows logged meanwhile + renames) is one
+    short transaction.
+    """
+    if await _column_type(conn, "trades", "timestamp") == "timestamp with time zone":
+        return
+    await conn.execute("ALTER TABLE trades ADD COLUMN IF NOT EXISTS ts timestamptz")
+    convert = """
+        CASE WHEN timestamp ~ '^\\d{4}-\\d{2}-\\d{2}'
+             THEN timestamp::timestamp AT TIME ZONE 'UTC' END
+    """
+    # walk id ranges rather than "WHERE ts IS NULL": unparseable text stays NULL and must not loop
+    lo, hi = await conn.fetchrow("SELECT min(id), max(id) FROM trades")
+    for start in range(lo or 0, (hi or 0) + 1, BACKFILL_BATCH):
+        await conn.execute(f"""
+            UPDATE trades SET ts = {convert}
+            WHERE id >= $1 AND id < $2 AND ts IS NULL AND timestamp IS NOT NULL
+        """, start, start + BACKFILL_BATCH)
+        await asyncio.sleep(0)
+    async with conn.transaction():
+        await conn.execute(f"UPDATE trades SET ts = {convert} WHERE ts IS NULL AND timestamp IS NOT NULL")
+        await conn.execute("ALTER TABLE trades RENAME COLUMN timestamp TO timestamp_text")
+        await conn.execute("ALTER TABLE trades RENAME COLUMN ts TO timestamp")
+        await conn.execute("ALTER TABLE trades ALTER COLUMN timestamp SET DEFAULT now()")
+        await conn.execute("ALTER TABLE trades DROP COLUMN timestamp_text")
+
+async def m004_user_ts_index(conn):
+    """
+    (user_id, timestamp) serves /saleshistory's ORDER BY ... LIMIT and /profitgraph's ordered
+    scan; the INCLUDEd columns let them and /checkprofit's sums run as index-only scans.
+    """
+    await _create_index_concurrently(conn, "trades_user_ts", """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS trades_user_ts
+        ON trades (user_id, timestamp) INCLUDE (player, quantity, sell, profit, ea_tax)
+    """)
+
+async def m005_trader_stats(conn):
+    """Per-user aggregates (portfolio_stats), filled once from the existing trades."""
+    await conn.execute(portfolio_stats.SCHEMA)
+    await portfolio_stats.rebuild_stats(conn)
+
+async def m006_positions(conn):
+    """Open positions: buys logged before the sell price is known, valued by /positions."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS positions (
+            id BIGSERIAL PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            player TEXT NOT NULL,
+            card_id TEXT,
+            version TEXT,
+            buy INTEGER NOT NULL,
+            quantity INTEGER NOT NULL CHECK (quantity > 0),
+            platform TEXT NOT NULL,
+            tag TEXT,
+            notes TEXT,
+            opened_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    await conn.execute("CREATE INDEX IF NOT EXISTS positions_user ON positions (user_id)")
+
+async def m007_leaderboard(conn):
+    """
+    guild_traders records which servers a trader uses the portfolio commands in (trades carry
+    no guild). The covering index gains `buy` so /leaderboard's ROI sums stay index-only; the
+    old one is dropped once its replacement is built.
+    """
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS guild_traders (
+            guild_id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        )
+    """)
+    await _create_index_concurrently(conn, "trades_user_ts_cover", """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS trades_user_ts_cover
+        ON trades (user_id, timestamp) INCLUDE (player, quantity, buy, sell, profit, ea_tax)
+    """)
+    await conn.execute("DROP INDEX CONCURRENTLY IF EXISTS trades_user_ts")
+
+MIGRATIONS: List[Tuple[int, str, Callable[..., Awaitable[None]]]] = [
+    (1, "base schema", m001_base),
+    (2, "trades surrogate id", m002_trade_id),
+    (3, "trades.timestamp as timestamptz", m003_timestamptz),
+    (4, "trades (user_id, timestamp) covering index", m004_user_ts_index),
+    (5, "per-user trader stats", m005_trader_stats),
+    (6, "open positions", m006_positions),
+    (7, "guild traders + leaderboard covering index", m007_leaderboard),
+]
+
+async def migrate(pool) -> List[str]:
+    """Apply pending MIGRATIONS; returns the names applied."""
+    if getattr(pool, "dialect", None) == "sqlite":
+        return await _migrate_sqlite(pool)
+    applied = []
+    async with pool.acquire() as conn:
+        await conn.execute("SELECT pg_advisory_lock($1)", LOCK_ID)
+        try:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT,
+                    applied_at TIMESTAMPTZ DEFAULT now()
+                )
+            """)
+            done = {r["version"] for r in await conn.fetch("SELECT version FROM schema_migrations")}
+            for version, name, step in MIGRATIONS:
+                if version in done: continue
+                await step(conn)
+                await conn.execute("INSERT INTO schema_migrations (version, name) VALUES ($1, $2)", version, name)
+                applied.append(name)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", LOCK_ID)
+    return applied
+
+async def _migrate_sqlite(pool) -> List[str]:
+    # SQLite stand-in (portfolio_db): create the end state of MIGRATIONS directly
+    from portfolio_db import SQLITE_SCHEMA
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT,
+                applied_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        done = {r["version"] for r in await conn.fetch("SELECT version FROM schema_migrations")}
+        if len(done) == len(MIGRATIONS):
+            return []
+        async with conn.transaction():
+            await conn.execute(SQLITE_SCHEMA)
+            await conn.execute(portfolio_stats.SCHEMA)
+            await portfolio_stats.rebuild_stats(conn)
+            for version, name, _ in MIGRATIONS:
+                if version in done: continue
+                await conn.execute("INSERT INTO schema_migrations (version, name) VALUES ($1, $2)", version, name)
+    return [name for version, name, _ in MIGRATIONS if version not in done]
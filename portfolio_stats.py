@@ -0,0 +1,108 @@
+# portfolio_stats.py
+from typing import Optional
+
+# One trader_stats row per user plus trader_tag_counts, kept in step with `trades` by
+# record_trade() in the same transaction as the INSERT; rebuild_stats() recomputes them.
+# Queries stick to SQL that portfolio_db's SQLite stand-in can run as well as Postgres.
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS trader_stats (
+        user_id TEXT PRIMARY KEY,
+        trades INTEGER NOT NULL DEFAULT 0,
+        total_profit BIGINT NOT NULL DEFAULT 0,
+        total_tax BIGINT NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        best_profit BIGINT,
+        best_player TEXT
+    );
+    CREATE TABLE IF NOT EXISTS trader_tag_counts (
+        user_id TEXT NOT NULL,
+        tag TEXT NOT NULL,
+        n INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, tag)
+    );
+"""
+
+async def record_trade(conn, user_id: str, player: str, tag: Optional[str], profit: int, ea_tax: int):
+    # cast every use of $2: uncast, Postgres deduces bigint from the column and int4 from "> 0"
+    await conn.execute("""
+        INSERT INTO trader_stats AS s (user_id, trades, total_profit, total_tax, wins, best_profit, best_player)
+        VALUES ($1, 1, $2::bigint, $3::bigint, CASE WHEN $2::bigint > 0 THEN 1 ELSE 0 END, $2::bigint, $4)
+        ON CONFLICT (user_id) DO UPDATE SET
+            trades = s.trades + 1,
+            total_profit = s.total_profit + EXCLUDED.total_profit,
+            total_tax = s.total_tax + EXCLUDED.total_tax,
+            wins = s.wins + EXCLUDED.wins,
+            best_player = CASE WHEN s.best_profit IS NULL OR EXCLUDED.best_profit > s.best_profit
+                               THEN EXCLUDED.best_player ELSE s.best_player END,
+            best_profit = CASE WHEN s.best_profit IS NULL OR EXCLUDED.best_profit > s.best_profit
+                               THEN EXCLUDED.best_profit ELSE s.best_profit END
+    """, user_id, profit or 0, ea_tax or 0, player)
+    await conn.execute("""
+        INSERT INTO trader_tag_counts AS t (user_id, tag, n) VALUES ($1, COALESCE(NULLIF($2, ''), 'N/A'), 1)
+        ON CONFLICT (user_id, tag) DO UPDATE SET n = t.n + 1
+    """, user_id, tag)
+
+async def rebuild_stats(conn, user_id: Optional[str] = None) -> int:
+    """Recompute the aggregates from `trades` for one user (or everyone); returns users rebuilt."""
+    async with conn.transaction():
+        await conn.execute("DELETE FROM trader_stats WHERE $1::text IS NULL OR user_id = $1", user_id)
+        await conn.execute("DELETE FROM trader_tag_counts WHERE $1::text IS NULL OR user_id = $1", user_id)
+        status = await conn.execute("""
+            INSERT INTO trader_stats (user_id, trades, total_profit, total_tax, wins, best_profit, best_player)
+            SELECT user_id, COUNT(*), COALESCE(SUM(profit), 0), COALESCE(SUM(ea_tax), 0),
+                   COUNT(*) FILTER (WHERE profit > 0), MAX(profit),
+                   (SELECT b.player FROM trades b WHERE b.user_id = t.user_id
+                    ORDER BY b.profit DESC NULLS LAST, b.id LIMIT 1)
+            FROM trades t WHERE $1::text IS NULL OR user_id = $1
+            GROUP BY user_id
+        """, user_id)
+        await conn.execute("""
+            INSERT INTO trader_tag_counts (user_id, tag, n)
+            SELECT user_id, COALESCE(NULLIF(tag, ''), 'N/A'), COUNT(*)
+            FROM trades WHERE $1::text IS NULL OR user_id = $1
+            GROUP BY 1, 2
+        """, user_id)
+    return int(status.split()[-1])
+
+async def fetch_stats(conn, user_id: str):
+    """Everything /checkprofit and /traderprofile show, as one row (NULLs for a new user)."""
+    return await conn.fetchrow("""
+        SELECT (SELECT starting_balance FROM portfolio WHERE user_id = $1) AS starting_balance,
+               s.trades, s.total_profit, s.total_tax, s.wins, s.best_profit, s.best_player,
+               (SELECT tag FROM trader_tag_counts WHERE user_id = $1 ORDER BY n DESC, tag LIMIT 1) AS top_tag
+        FROM (SELECT $1::text AS user_id) u LEFT JOIN trader_stats s USING (user_id)
+    """, user_id)
+
+async def join_guild(conn, guild_id, user_id: str) -> bool:
+    """Put a trader on a server's /leaderboard (trades themselves carry no guild); True if new."""
+    if not guild_id:
+        return False
+    status = await conn.execute("""
+        INSERT INTO guild_traders (guild_id, user_id) VALUES ($1, $2) ON CONFLICT DO NOTHING
+    """, str(guild_id), user_id)
+    return status.endswith(" 1")
+
+async def fetch_leaderboard(conn, guild_id: str, since, min_trades: int = 1):
+    """
+    Every guild trader's totals since `since` with their rank by profit, ROI and win rate, in
+    one pass over trades_user_ts_cover. Traders under `min_trades` rank last for ROI/win rate.
+    """
+    return await conn.fetch("""
+        WITH per_user AS (
+            SELECT t.user_id, SUM(t.profit) AS profit, SUM(t.buy::bigint * t.quantity) AS cost,
+                   COUNT(*) AS trades, COUNT(*) FILTER (WHERE t.profit > 0) AS wins
+            FROM guild_traders g
+            JOIN trades t ON t.user_id = g.user_id AND t.timestamp >= $2
+            WHERE g.guild_id = $1
+            GROUP BY t.user_id
+        ), scored AS (
+            SELECT *, profit::float8 / NULLIF(cost, 0) AS roi, wins::float8 / trades AS win_rate
+            FROM per_user
+        )
+        SELECT *,
+               RANK() OVER (ORDER BY profit DESC) AS profit_rank,
+               RANK() OVER (ORDER BY CASE WHEN trades >= $3 THEN roi END DESC NULLS LAST) AS roi_rank,
+               RANK() OVER (ORDER BY CASE WHEN trades >= $3 THEN win_rate END DESC NULLS LAST, trades DESC) AS winrate_rank
+        FROM scored
+    """, str(guild_id), since, min_trades)
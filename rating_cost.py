@@ -0,0 +1,123 @@
+# rating_cost.py
+import time, hashlib
+from functools import lru_cache
+from typing import List, Dict, Any, NamedTuple, Optional
+
+import numpy as np
+
+from sbc_solver import SLOTS, cards_from_cheapest, group_by_rating
+
+TABLE_RATINGS = range(75, 92)      # ratings whose cheapest lists feed the table
+WINDOW_BELOW, WINDOW_ABOVE = 6, 5  # ratings considered around each target (12 in total)
+
+@lru_cache(maxsize=4)
+def _count_vectors(n: int, k: int) -> np.ndarray:
+    """Every way to spread n slots over k ratings, as an (N, k) int8 matrix of counts."""
+    rows = np.zeros((1, 0), dtype=np.int8)
+    used = np.zeros(1, dtype=np.int16)
+    for _ in range(k - 1):
+        choices = n - used + 1                      # this column takes 0..n-used
+        parent = np.repeat(np.arange(len(rows)), choices)
+        col = np.arange(choices.sum()) - np.repeat(np.cumsum(choices) - choices, choices)
+        rows = np.hstack([rows[parent], col[:, None].astype(np.int8)])
+        used = used[parent] + col
+    last = (n - used).astype(np.int8)
+    return np.hstack([rows, last[:, None]])
+
+def _squad_ratings(counts: np.ndarray, ratings: np.ndarray, slots: int) -> np.ndarray:
+    """sbc_solver.squad_rating for every row of `counts` at once."""
+    total = counts @ ratings.astype(np.int32)
+    avg = total / slots
+    excess = np.zeros(len(counts))
+    for j, r in enumerate(ratings):
+        excess += counts[:, j] * np.maximum(r - avg, 0)
+    return np.rint(total + excess).astype(np.int64) // slots
+
+class _Snapshot(NamedTuple):
+    groups: Dict[int, List[Dict[str, Any]]]
+    rows: Dict[int, Dict[str, Any]]
+    signature: Optional[str]
+    built_at: float
+
+class RatingCostTable:
+    """
+    target squad rating -> cheapest rating composition and its cost, for one platform.
+    Built from futbin_cheapest_by_rating rows: for each target every multiset of 11 ratings in
+    [target-6, target+5] is scored in one vectorised pass, priced with the k cheapest cards
+    at each rating. update() only rebuilds when the underlying prices changed.
+    update() runs in a worker thread, so everything it produces lives in one immutable
+    _Snapshot swapped in by a single store; readers take the snapshot once and use only it.
+    """
+    def __init__(self, slots: int = SLOTS):
+        self.slots = slots
+        self._snap = _Snapshot({}, {}, None, 0.0)
+
+    @property
+    def groups(self) -> Dict[int, List[Dict[str, Any]]]:
+        return self._snap.groups
+
+    @property
+    def rows(self) -> Dict[int, Dict[str, Any]]:
+        return self._snap.rows
+
+    @property
+    def signature(self) -> Optional[str]:
+        return self._snap.signature
+
+    @property
+    def built_at(self) -> float:
+        return self._snap.built_at
+
+    @staticmethod
+    def _signature(groups) -> str:
+        h = hashlib.sha1()
+        for r in sorted(groups):
+            h.update(f"{r}:{','.join(str(c['price']) for c in groups[r])};".encode())
+        return h.hexdigest()
+
+    def update(self, tables: Dict[int, List[Dict[str, Any]]]) -> bool:
+        """Feed {rating: cheapest rows}; returns True if the table was rebuilt."""
+        groups = group_by_rating(cards_from_cheapest(tables), 0, 99, keep=self.slots)
+        sig = self._signature(groups)
+        if sig == self.signature:
+            return False
+        rows = self._build(groups)  # slow: readers keep using the old snapshot meanwhile
+        self._snap = _Snapshot(groups, rows, sig, time.time())
+        return True
+
+    def _build(self, groups) -> Dict[int, Dict[str, Any]]:
+        if not groups: return {}
+        width = WINDOW_BELOW + WINDOW_ABOVE + 1
+        counts = _count_vectors(self.slots, width)
+        out = {}
+        for target in range(min(groups), max(groups) + 1):
+            window = np.arange(target - WINDOW_BELOW, target + WINDOW_ABOVE + 1)
+            # cum[j][k]: cost of the k cheapest cards at window[j] (inf when there aren't k of them)
+            cum = np.full((width, self.slots + 1), np.inf)
+            cum[:, 0] = 0
+            for j, r in enumerate(window):
+                prices = [c["price"] for c in groups.get(int(r), [])]
+                cum[j, 1:len(prices) + 1] = np.cumsum(prices)
+            cost = np.zeros(len(counts))
+            for j in range(width):
+                cost += cum[j][counts[:, j]]
+            rating = _squad_ratings(counts, window, self.slots)
+            cost[rating < target] = np.inf
+            best = int(np.argmin(cost))
+            if not np.isfinite(cost[best]): continue
+            comp = {int(window[j]): int(k) for j, k in enumerate(counts[best]) if k}
+            out[target] = {"rating": int(rating[best]), "cost": int(cost[best]), "counts": comp}
+        return out
+
+    def lookup(self, target: int) -> Optional[Dict[str, Any]]:
+        return self.rows.get(target)
+
+    def squad(self, target: int) -> Optional[Dict[str, Any]]:
+        """Same shape as sbc_solver.solve_cheapest_squad's result, straight from the table."""
+        snap = self._snap
+        row = snap.rows.get(target)
+        if not row: return None
+        players = []
+        for r in sorted(row["counts"], reverse=True):
+            players.extend(snap.groups[r][:row["counts"][r]])
+        return {"rating": row["rating"], "cost": row["cost"], "players": players, "optimal": True, "nodes": 0}
@@ -0,0 +1,76 @@
+# sbc_cache.py
+import os, json, time, sqlite3, hashlib
+
+CACHE_PATH = os.getenv("SBC_CACHE_PATH", "sbc_cache.sqlite3")
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8", "ignore")).hexdigest()
+
+class SBCCache:
+    """
+    Tiny persistent key/value store for scraped FUT.GG results.
+    Rows are keyed by (kind, url) and carry the hash of the page they were parsed from,
+    so an expired entry can be revalidated against a fresh download without re-parsing.
+    """
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_cache (
+                    kind TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (kind, url)
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def get(self, kind: str, url: str):
+        """Returns (value, digest, age_seconds) or None."""
+        try:
+            row = self._db().execute(
+                "SELECT payload, digest, fetched_at FROM scrape_cache WHERE kind=? AND url=?", (kind, url)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row: return None
+        try: value = json.loads(row[0])
+        except ValueError: return None
+        return value, row[1], time.time() - row[2]
+
+    def put(self, kind: str, url: str, digest: str, value) -> None:
+        try:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO scrape_cache (kind, url, digest, payload, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, url, digest, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+    def touch(self, kind: str, url: str) -> None:
+        """Content unchanged upstream: restart the TTL without rewriting the payload."""
+        try:
+            db = self._db()
+            db.execute("UPDATE scrape_cache SET fetched_at=? WHERE kind=? AND url=?", (time.time(), kind, url))
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+    def purge(self, max_age: float) -> int:
+        try:
+            db = self._db()
+            cur = db.execute("DELETE FROM scrape_cache WHERE fetched_at < ?", (time.time() - max_age,))
+            db.commit()
+            return cur.rowcount
+        except sqlite3.Error:
+            return 0
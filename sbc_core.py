@@ -1,6 +1,21 @@
 # sbc_core.py
+import re
 from collections import defaultdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Tuple
+
+# Chemistry points from teammates sharing an attribute: (players needed, points)
+CHEM_THRESHOLDS = {
+    "club":   ((2, 1), (5, 2), (8, 3)),
+    "nation": ((2, 1), (5, 2), (8, 3)),
+    "league": ((3, 1), (5, 2), (8, 3)),
+}
+MAX_PLAYER_CHEM = 3
+ATTRS = ("club", "league", "nation", "position", "rating", "band")
+
+def rating_band(rating: int) -> str:
+    if rating >= 75: return "gold"
+    if rating >= 65: return "silver"
+    return "bronze"
 
 def map_player(p: Dict[str, Any]) -> Dict[str, Any]:
     return {
@@ -11,12 +26,101 @@ def map_player(p: Dict[str, Any]) -> Dict[str, Any]:
         "league_name": (p.get("leagueName") or p.get("league_name") or p.get("league") or ""),
         "nation_name": (p.get("nationName") or p.get("nation_name") or p.get("nation") or ""),
         "club_name":   (p.get("clubName")   or p.get("club_name")   or p.get("club")   or ""),
+        # FUTBIN marks alternate positions with "+"/"++"; keep the base position
+        "position":    re.sub(r"\+", "", p.get("position") or p.get("pos") or "").upper(),
     }
 
+def iter_bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class CatalogIndex:
+    """
+    Whole-catalog index where card i is bit i. Every club/league/nation/position/rating/band
+    value maps to the bitset of its cards, so a squad is just an int mask and counts such as
+    "players from league X" are popcounts of an AND.
+    """
+    def __init__(self, players: List[Dict[str, Any]]):
+        self.cards: List[Dict[str, Any]] = []
+        self.by_name = defaultdict(list)
+        self.by_pid: Dict[str, int] = {}
+        self.bits = {a: defaultdict(int) for a in ATTRS}
+        for raw in players:
+            pl = map_player(raw)
+            if not pl["pid"] or not pl["name"]: continue
+            i = len(self.cards)
+            pl["club"], pl["league"], pl["nation"] = pl["club_name"], pl["league_name"], pl["nation_name"]
+            pl["band"] = rating_band(pl["rating"])
+            self.cards.append(pl)
+            self.by_name[(pl["name"] or "").lower()].append(pl)
+            self.by_pid[str(pl["pid"])] = i
+            bit = 1 << i
+            for a in ATTRS:
+                if pl[a] != "": self.bits[a][pl[a]] |= bit
+        self._at_least: Dict[int, int] = {}
+
+    def __len__(self):
+        return len(self.cards)
+
+    # ---- squad masks ----
+    def mask(self, idxs: Iterable[int]) -> int:
+        m = 0
+        for i in idxs: m |= 1 << i
+        return m
+
+    def mask_for_pids(self, pids: Iterable[Any]) -> int:
+        return self.mask(self.by_pid[str(p)] for p in pids if str(p) in self.by_pid)
+
+    def members(self, squad: int) -> List[Dict[str, Any]]:
+        return [self.cards[i] for i in iter_bits(squad)]
+
+    def rating_at_least(self, rating: int) -> int:
+        m = self._at_least.get(rating)
+        if m is None:
+            m = 0
+            for r, bits in self.bits["rating"].items():
+                if r >= rating: m |= bits
+            self._at_least[rating] = m
+        return m
+
+    # ---- constraint primitives ----
+    def count(self, squad: int, attr: str, value: Any) -> int:
+        return (squad & self.bits[attr].get(value, 0)).bit_count()
+
+    def count_rating_at_least(self, squad: int, rating: int) -> int:
+        return (squad & self.rating_at_least(rating)).bit_count()
+
+    def group_counts(self, squad: int, attr: str) -> Dict[Any, int]:
+        """{value: players in squad} for every value present in the squad."""
+        out = {}
+        for i in iter_bits(squad):
+            v = self.cards[i][attr]
+            if v != "" and v not in out:
+                out[v] = (squad & self.bits[attr].get(v, 0)).bit_count()
+        return out
+
+    def max_same(self, squad: int, attr: str) -> int:
+        """Size of the largest group sharing `attr` ("min 3 from same league" -> max_same >= 3)."""
+        return max(self.group_counts(squad, attr).values(), default=0)
+
+    def distinct(self, squad: int, attr: str) -> int:
+        return len(self.group_counts(squad, attr))
+
+    # ---- chemistry ----
+    def chemistry(self, squad: int) -> Tuple[int, Dict[int, int]]:
+        """Total squad chemistry and {card index: chem} (positions/icons/heroes not modelled)."""
+        counts = {a: self.group_counts(squad, a) for a in CHEM_THRESHOLDS}
+        per = {}
+        for i in iter_bits(squad):
+            pl, pts = self.cards[i], 0
+            for a, steps in CHEM_THRESHOLDS.items():
+                n = counts[a].get(pl[a], 0)
+                pts += max((p for need, p in steps if n >= need), default=0)
+            per[i] = min(MAX_PLAYER_CHEM, pts)
+        return sum(per.values()), per
+
 def build_indexes(players: List[Dict[str, Any]]):
-    by_name = defaultdict(list)
-    for raw in players:
-        pl = map_player(raw)
-        if not pl["pid"] or not pl["name"]: continue
-        by_name[(pl["name"] or "").lower()].append(pl)
-    return {"by_name": by_name}
\ No newline at end of file
+    index = CatalogIndex(players)
+    return {"by_name": index.by_name, "index": index}
@@ -0,0 +1,157 @@
+# sbc_requirements.py
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Tuple
+
+from sbc_core import CatalogIndex, iter_bits, rating_band
+from sbc_solver import squad_rating, SLOTS
+
+class Requirement(NamedTuple):
+    """
+    One compiled SBC bullet.
+      kind    team_rating | chemistry | squad_size | distinct | max_same | quality |
+              count_band | count_rating | count_from | rarity
+      op      min | max | exact
+      value   the number the squad's measure is compared with
+      target  attribute/subject the measure is about ("league", "gold", "Premier League", ...)
+    """
+    kind: str
+    op: str
+    value: int
+    target: str = ""
+    text: str = ""
+
+# bullets we could not compile, so the grammar below can grow
+UNKNOWN = Counter()
+
+_ATTR_WORDS = {"nation": "nation", "nationalit": "nation", "countr": "nation",
+               "league": "league", "club": "club", "team": "club"}
+_BANDS = ("bronze", "silver", "gold")
+_SPECIALS = ("team of the week", "totw", "tots", "team of the season", "inform", "rare", "special", "hero", "icon")
+
+def _norm(text: str) -> str:
+    t = (text or "").lower().replace("–", "-").replace("•", " ")
+    t = re.sub(r"\bmin(?:imum|\.)?", "min", t)
+    t = re.sub(r"\bmax(?:imum|\.)?", "max", t)
+    t = re.sub(r"\bexact(?:ly)?\b", "exact", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+def _op(t: str, default: str = "min") -> str:
+    m = re.search(r"\b(min|max|exact)\b", t)
+    return m.group(1) if m else default
+
+def _attr(t: str) -> Optional[str]:
+    for word, attr in _ATTR_WORDS.items():
+        if word in t: return attr
+    return None
+
+@lru_cache(maxsize=4096)
+def _compile_norm(t: str) -> Optional[Requirement]:
+    nums = [int(x) for x in re.findall(r"\d+", t)]
+    op = _op(t)
+
+    if re.search(r"(team|squad) rating", t) and nums:
+        return Requirement("team_rating", op, nums[-1])
+    if "chem" in t and nums:
+        return Requirement("chemistry", op, nums[-1])
+    if re.search(r"(number of )?players in (the )?squad", t) and nums:
+        return Requirement("squad_size", _op(t, "exact"), nums[-1])
+    m = re.search(r"same (nation|nationality|country|league|club)", t)
+    if m and nums:
+        return Requirement("max_same", op, nums[-1], _attr(m.group(1)))
+    if re.search(r"\b(nationalities|nations|countries|leagues|clubs)\b", t) and nums and "player" not in t:
+        return Requirement("distinct", op, nums[-1], _attr(t))
+    m = re.search(r"\b(\d+)\s*ovr\b|\brated (\d+)|\bovr:? ?(\d+)|\b(?:ovr|rating) of (?:at least )?(\d+)", t)
+    if m and len(nums) >= 2:
+        rating = int(next(g for g in m.groups() if g))
+        count = next(n for n in nums if n != rating) if any(n != rating for n in nums) else nums[0]
+        return Requirement("count_rating", op, count, str(rating))
+    band = next((b for b in _BANDS if b in t), None)
+    if band and re.search(r"player (quality|level)", t):
+        return Requirement("quality", _op(t, "exact"), _BANDS.index(band), band)
+    if band and nums:
+        return Requirement("count_band", op, nums[0], band)
+    special = next((s for s in _SPECIALS if s in t), None)
+    if special and nums:
+        return Requirement("rarity", op, nums[0], special)
+    m = re.search(r"players? from:? (.+)$", t) or re.search(r"^(.+?):\s*(?:min|max|exact)\s*\d+\s*players?", t)
+    if m and nums:
+        target = re.sub(r"\b(min|max|exact)\b|\d+", "", m.group(1)).strip(" :.-")
+        # a rating bullet the patterns above missed is not a league/nation/club: leave it UNKNOWN
+        if target and not re.search(r"\b(ovr|rated|ratings?)\b", target):
+            return Requirement("count_from", op, nums[0], target)
+    return None
+
+def compile_requirement(text: str) -> Optional[Requirement]:
+    req = _compile_norm(_norm(text))
+    return req._replace(text=text) if req else None
+
+def compile_requirements(bullets: Iterable[str]) -> Tuple[List[Requirement], List[str]]:
+    """Compiled requirements plus the bullets nothing matched (also tallied in UNKNOWN)."""
+    reqs, unknown = [], []
+    for b in bullets or []:
+        r = compile_requirement(b)
+        if r: reqs.append(r)
+        else:
+            unknown.append(b)
+            UNKNOWN[_norm(b)] += 1
+    return reqs, unknown
+
+def _compare(op: str, actual: int, value: int) -> bool:
+    if op == "max": return actual <= value
+    if op == "exact": return actual == value
+    return actual >= value
+
+class _SquadFacts:
+    """Measures of one squad, each computed at most once however many requirements read it."""
+    def __init__(self, index: Optional[CatalogIndex], squad: int = 0, ratings: Optional[List[int]] = None):
+        self.index, self.squad = index, squad
+        self.ratings = ratings if ratings is not None else [index.cards[i]["rating"] for i in iter_bits(squad)]
+        self._groups: Dict[str, Dict[Any, int]] = {}
+        self._chem = None
+
+    def groups(self, attr: str):
+        if attr not in self._groups:
+            self._groups[attr] = self.index.group_counts(self.squad, attr)
+        return self._groups[attr]
+
+    def measure(self, req: Requirement) -> Optional[int]:
+        k = req.kind
+        if k == "team_rating": return squad_rating(self.ratings, SLOTS)
+        if k == "squad_size": return len(self.ratings)
+        if k == "count_rating": return sum(1 for r in self.ratings if r >= int(req.target))
+        if k == "quality":
+            bands = {_BANDS.index(rating_band(r)) for r in self.ratings}
+            if not bands: return None
+            if req.op == "max": return max(bands)
+            if req.op == "min": return min(bands)
+            return bands.pop() if len(bands) == 1 else -1
+        if self.index is None: return None
+        if k == "chemistry":
+            if self._chem is None: self._chem = self.index.chemistry(self.squad)[0]
+            return self._chem
+        if k == "distinct": return len(self.groups(req.target))
+        if k == "max_same": return max(self.groups(req.target).values(), default=0)
+        if k == "count_band": return self.groups("band").get(req.target, 0)
+        if k == "count_from":
+            want = req.target.lower()
+            for attr in ("league", "nation", "club"):
+                for v, n in self.groups(attr).items():
+                    if v.lower() == want: return n
+            return 0
+        return None  # rarity: not in the catalog
+
+def check_requirements(reqs: List[Requirement], index: Optional[CatalogIndex] = None, squad: int = 0,
+                       ratings: Optional[List[int]] = None) -> List[Tuple[Requirement, Optional[int], Optional[bool]]]:
+    """
+    Evaluate every requirement against a squad given as a CatalogIndex mask, or as bare ratings
+    (then only rating/size requirements can be judged). ok is None when a bullet can't be checked.
+    """
+    facts = _SquadFacts(index, squad, ratings)
+    out = []
+    for r in reqs:
+        actual = facts.measure(r)
+        ok = None if actual is None else _compare(r.op, actual, r.value)
+        out.append((r, actual, ok))
+    return out
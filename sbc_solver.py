@@ -0,0 +1,161 @@
+# sbc_solver.py
+import time
+from itertools import accumulate
+from typing import List, Dict, Any, Iterable, Optional
+
+SLOTS = 11
+
+def squad_rating(ratings: Iterable[int], slots: int = SLOTS) -> int:
+    """
+    In-game squad rating: every player above the average adds their excess on top of the raw
+    total, the corrected total is rounded and the result floored over all 11 slots.
+    """
+    ratings = list(ratings)
+    total = sum(ratings)
+    avg = total / slots
+    excess = sum(r - avg for r in ratings if r > avg)
+    return int(round(total + excess)) // slots
+
+def cards_from_cheapest(tables: Dict[int, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Flatten {rating: futbin_cheapest_by_rating(...) rows} into solver cards."""
+    out = []
+    for rating, rows in tables.items():
+        for row in rows or []:
+            if row.get("name") and row.get("price"):
+                out.append({"pid": None, "name": row["name"], "rating": int(rating), "price": int(row["price"])})
+    return out
+
+def group_by_rating(cards, min_rating: int, max_rating: int, keep: int) -> Dict[int, List[Dict[str, Any]]]:
+    groups: Dict[int, List[Dict[str, Any]]] = {}
+    for c in cards:
+        r = int(c.get("rating") or 0)
+        if r < min_rating or r > max_rating or c.get("price") is None: continue
+        groups.setdefault(r, []).append(c)
+    for r, lst in groups.items():
+        # at equal price (owned cards are all 0) use untradeables first: they can't be sold anyway
+        lst.sort(key=lambda c: (c["price"], not c.get("untradeable")))
+        seen, uniq = set(), []
+        for c in lst:
+            key = (c.get("name") or "").lower()
+            if key in seen: continue
+            seen.add(key); uniq.append(c)
+            if len(uniq) >= keep: break
+        groups[r] = uniq
+    return groups
+
+def _preference(c: Dict[str, Any]) -> tuple:
+    return (c["price"], -int(c.get("rating") or 0), not c.get("untradeable"))
+
+def one_per_name(cards, exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """
+    A squad can hold each player once, so keep only each name's best entry (cheapest, then
+    highest rated, then untradeable) and drop names in `exclude`. The search then never plans on a card the
+    squad couldn't actually use.
+    """
+    best: Dict[str, Dict[str, Any]] = {}
+    skip = {(n or "").lower() for n in exclude}
+    for c in cards:
+        key = (c.get("name") or "").lower()
+        if key in skip or c.get("price") is None: continue
+        cur = best.get(key)
+        if cur is None or _preference(c) < _preference(cur):
+            best[key] = c
+    return list(best.values())
+
+def solve_cheapest_squad(
+    cards: List[Dict[str, Any]],
+    target: int,
+    slots: int = SLOTS,
+    min_rating: int = 0,
+    max_rating: int = 99,
+    at_least: Optional[Dict[int, int]] = None,
+    fixed: Iterable[Dict[str, Any]] = (),
+    time_limit: float = 2.0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Cheapest set of `slots` cards (including `fixed` ones, which cost nothing) whose squad_rating
+    reaches `target`.
+      min_rating / max_rating  bounds for every bought card
+      at_least                 {rating: n} -> at least n players rated `rating` or higher
+    Only ratings matter for the squad rating, so the search is a branch-and-bound over how many
+    of the cheapest cards to take at each rating (highest first), pruned by the best rating still
+    reachable and by the cheapest possible fill of the remaining slots.
+    Returns {"rating", "cost", "players", "optimal", "nodes"} or None if infeasible.
+    """
+    fixed = list(fixed)
+    fixed_r = [int(c.get("rating") or 0) for c in fixed]
+    free = slots - len(fixed_r)
+    if free < 0: return None
+    at_least = sorted((at_least or {}).items(), reverse=True)
+
+    cards = one_per_name(cards, (c.get("name") for c in fixed))
+    groups = group_by_rating(cards, min_rating, max_rating, keep=free + 4)
+    ratings = sorted(groups, reverse=True)
+    prefix = {r: [0] + list(accumulate(c["price"] for c in groups[r][:free])) for r in ratings}
+
+    # lb[i][m]: cheapest possible cost of m cards drawn from ratings[i:]
+    lb = [[0]] * (len(ratings) + 1)
+    pool: List[int] = []
+    for i in range(len(ratings) - 1, -1, -1):
+        pool = sorted(pool + [c["price"] for c in groups[ratings[i]][:free]])[:free]
+        lb[i] = [0] + list(accumulate(pool))
+    INF = float("inf")
+
+    def lower(i: int, m: int) -> float:
+        if m == 0: return 0
+        row = lb[i] if i < len(ratings) else [0]
+        return row[m] if m < len(row) else INF
+
+    def quotas_ok(chosen: List[int], floor_r: int) -> bool:
+        # thresholds above floor_r can no longer gain players
+        for thr, need in at_least:
+            if thr <= floor_r: break
+            if sum(1 for r in chosen if r >= thr) < need: return False
+        return True
+
+    best = {"cost": INF, "counts": None}
+    nodes = 0
+    deadline = time.perf_counter() + time_limit
+    timed_out = False
+
+    def dfs(i: int, left: int, chosen: List[int], counts: List[tuple], cost: int):
+        nonlocal nodes, timed_out
+        nodes += 1
+        if nodes & 1023 == 0 and time.perf_counter() > deadline:
+            timed_out = True
+        if timed_out: return
+        if left == 0:
+            if squad_rating(chosen, slots) >= target and quotas_ok(chosen, -1) and cost < best["cost"]:
+                best["cost"], best["counts"] = cost, list(counts)
+            return
+        if i >= len(ratings) or cost + lower(i, left) >= best["cost"]: return
+        r = ratings[i]
+        nxt = ratings[i + 1] if i + 1 < len(ratings) else None
+        for k in range(0, min(left, len(groups[r])) + 1):
+            rem = left - k
+            if rem and nxt is None: continue
+            picked = chosen + [r] * k
+            # best case for the rest: every remaining slot at the next rating down
+            if squad_rating(picked + [nxt] * rem if rem else picked, slots) < target: continue
+            if not quotas_ok(picked, nxt if rem else -1): continue
+            c = cost + prefix[r][k]
+            if c + lower(i + 1, rem) >= best["cost"]: continue
+            dfs(i + 1, rem, picked, counts + [(r, k)] if k else counts, c)
+
+    dfs(0, free, fixed_r, [], 0)
+    if best["counts"] is None: return None
+
+    # names are unique after one_per_name, so the k cheapest at each rating are exactly what was costed
+    players = [c for r, k in best["counts"] for c in groups[r][:k]]
+    players.sort(key=lambda c: (-c["rating"], c["price"]))
+    squad = fixed + players
+    rating = squad_rating((int(c.get("rating") or 0) for c in squad), slots)
+    if len(squad) != slots or rating < target:
+        return None
+    return {
+        "rating": rating,
+        "cost": sum(c["price"] for c in players),
+        "players": squad,
+        "optimal": not timed_out,
+        "nodes": nodes,
+    }
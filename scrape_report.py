@@ -0,0 +1,82 @@
+# scrape_report.py
+import os, json, math, time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+REPORT_DIR = os.getenv("SCRAPE_REPORT_DIR", "scrape_reports")
+PHASES = ("wait", "fetch", "parse", "write")  # wait = semaphore/rate-limiter/sleep time before a request
+
+def _pct(values: List[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    if not values: return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, max(0, math.ceil(q * len(s)) - 1))]
+
+class RunReport:
+    """
+    Per-page phase timings, retries and blocked pages for one scraper run, summarised as JSON
+    so runs can be compared (was it the network, parsing, or throttling?).
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.pages: Dict[int, Dict[str, Any]] = {}
+        self.blocked: Dict[int, Any] = {}
+
+    def _page(self, page: int) -> Dict[str, Any]:
+        return self.pages.setdefault(page, {"retries": 0, **{p: 0.0 for p in PHASES}})
+
+    @contextmanager
+    def timed(self, page: int, phase: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._page(page)[phase] += time.perf_counter() - t
+
+    def retry(self, page: int) -> None:
+        self._page(page)["retries"] += 1
+
+    def block(self, page: int, reason) -> None:
+        """A page that came back refused/throttled (HTTP status) or empty when it shouldn't be."""
+        self.blocked[page] = reason
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._t0
+        fetched = [p for p in self.pages if p not in self.blocked]
+        out = {
+            "name": self.name,
+            "started_at": self.started,
+            "elapsed_s": round(elapsed, 3),
+            "pages": len(self.pages),
+            "pages_per_sec": round(len(fetched) / elapsed, 3) if elapsed else 0.0,
+            "retries": sum(p["retries"] for p in self.pages.values()),
+            "blocked_pages": {str(k): v for k, v in sorted(self.blocked.items())},
+            "phases": {},
+        }
+        for ph in PHASES:
+            vals = [p[ph] for p in self.pages.values()]
+            out["phases"][ph] = {
+                "total_s": round(sum(vals), 3),
+                "p50_ms": round(_pct(vals, 0.50) * 1000, 1),
+                "p95_ms": round(_pct(vals, 0.95) * 1000, 1),
+            }
+        return out
+
+    def write(self, path: Optional[str] = None) -> str:
+        """Write the summary (plus raw per-page rows) and return the path."""
+        if path is None:
+            os.makedirs(REPORT_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+            path = os.path.join(REPORT_DIR, f"{self.name}-{stamp}.json")
+        data = {**self.summary(), "per_page": {str(k): v for k, v in sorted(self.pages.items())}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def print_summary(self) -> None:
+        s = self.summary()
+        phases = " · ".join(f"{ph} p50 {v['p50_ms']:.0f}/p95 {v['p95_ms']:.0f} ms" for ph, v in s["phases"].items())
+        print(f"📈 {s['pages']} pages · {s['pages_per_sec']:.2f} pages/sec · {s['retries']} retries · "
+              f"{len(s['blocked_pages'])} blocked · {phases}")
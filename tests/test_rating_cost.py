@@ -0,0 +1,23 @@
+import random
+
+from rating_cost import RatingCostTable
+
+
+def _tables(seed):
+    rnd = random.Random(seed)
+    return {r: [{"name": f"P{r}-{i}", "price": rnd.randint(300, 9000) * (r - 70)} for i in range(11)]
+            for r in range(78, 90)}
+
+
+def test_update_swaps_in_one_consistent_snapshot():
+    table = RatingCostTable()
+    assert table.update(_tables(1))
+    before = table._snap
+    assert not table.update(_tables(1))  # same prices: no rebuild
+    assert table._snap is before
+    assert table.update(_tables(2))
+    assert table._snap is not before and table.rows is table._snap.rows
+
+    res = table.squad(84)
+    assert res["cost"] == table.rows[84]["cost"] == sum(c["price"] for c in res["players"])
+    assert len(res["players"]) == 11
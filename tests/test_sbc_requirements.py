@@ -0,0 +1,19 @@
+from sbc_requirements import compile_requirements
+
+
+def test_ovr_of_bullets_compile_to_count_rating():
+    for text in ("Min. OVR of 83: Min. 4 Players", "Rating of 83: Min. 4 Players", "Min. 4 Players: OVR of 83"):
+        (req,), unknown = compile_requirements([text])
+        assert (req.kind, req.op, req.value, req.target) == ("count_rating", "min", 4, "83")
+        assert unknown == []
+
+
+def test_unrecognised_rating_bullet_is_unknown_not_count_from():
+    reqs, unknown = compile_requirements(["Player ratings: Min. 3 Players"])
+    assert reqs == []
+    assert unknown == ["Player ratings: Min. 3 Players"]
+
+
+def test_count_from_still_compiles():
+    (req,), _ = compile_requirements(["Min. 1 Players from: Premier League"])
+    assert (req.kind, req.value, req.target) == ("count_from", 1, "premier league")
@@ -0,0 +1,42 @@
+from sbc_solver import solve_cheapest_squad, squad_rating, SLOTS
+
+
+def _card(name, rating, price, **kw):
+    return {"name": name, "rating": rating, "price": price, **kw}
+
+
+def test_owned_card_sharing_a_name_with_a_bought_card_still_fills_the_squad():
+    cards = [_card("Smith", 86, 0, owned=True), _card("Smith", 84, 100)]
+    cards += [_card(f"A{i}", 84, 200 + i) for i in range(9)]
+    cards += [_card(f"C{i}", 90, 5000 + i) for i in range(20)]
+    res = solve_cheapest_squad(cards, 84)
+    assert res is not None
+    names = [c["name"].lower() for c in res["players"]]
+    assert len(names) == SLOTS and len(set(names)) == SLOTS
+    assert res["rating"] >= 84
+    assert res["rating"] == squad_rating(c["rating"] for c in res["players"])
+    assert res["cost"] == sum(c["price"] for c in res["players"])
+    assert [c for c in res["players"] if c["name"] == "Smith"][0]["rating"] == 86
+
+
+def test_fixed_names_are_not_bought_again():
+    fixed = [_card("Smith", 84, 0)]
+    cards = [_card("Smith", 84, 50)] + [_card(f"A{i}", 84, 200 + i) for i in range(10)]
+    res = solve_cheapest_squad(cards, 84, fixed=fixed)
+    assert res is not None
+    assert [c["name"] for c in res["players"]].count("Smith") == 1
+    assert len(res["players"]) == SLOTS
+
+
+def test_not_enough_distinct_names_is_infeasible():
+    cards = [_card("Same", 90, 100 + i) for i in range(20)]
+    assert solve_cheapest_squad(cards, 80) is None
+
+
+def test_untradeable_owned_cards_are_used_before_tradeable_ones():
+    # tradeables listed first, so input order alone wouldn't pick the untradeables
+    owned = [_card(f"T{i}", 84, 0, owned=True, untradeable=False) for i in range(6)]
+    owned += [_card(f"U{i}", 84, 0, owned=True, untradeable=True) for i in range(6)]
+    res = solve_cheapest_squad(owned, 84)
+    assert res is not None and res["cost"] == 0
+    assert sum(1 for c in res["players"] if c["untradeable"]) == 6
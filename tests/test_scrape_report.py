@@ -0,0 +1,25 @@
+from scrape_report import _pct
+
+
+def _range(n):
+    return [float(i) for i in range(1, n + 1)]
+
+
+def test_pct_exact_rank_is_not_rounded_up():
+    # q * n lands on an integer: nearest rank is exactly that rank
+    assert _pct(_range(10), 0.50) == 5.0
+    assert _pct(_range(20), 0.95) == 19.0
+    assert _pct(_range(100), 0.95) == 95.0
+
+
+def test_pct_fractional_rank_rounds_up():
+    assert _pct(_range(7), 0.50) == 4.0
+    assert _pct(_range(10), 0.95) == 10.0
+
+
+def test_pct_edges():
+    assert _pct([], 0.5) == 0.0
+    assert _pct([3.0], 0.95) == 3.0
+    assert _pct(_range(10), 1.0) == 10.0
+    assert _pct(_range(10), 0.0) == 1.0
+    assert _pct([5.0, 1.0, 3.0], 0.5) == 3.0  # unsorted input
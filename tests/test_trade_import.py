@@ -0,0 +1,26 @@
+from trade_import import parse_trades, INT4_MAX
+
+HEADER = "player,version,buy,sell,quantity,platform\n"
+
+
+def _parse(rows):
+    return parse_trades((HEADER + rows).encode(), "u")
+
+
+def test_non_integer_and_non_finite_values_are_rejected():
+    records, errors = _parse("A,,inf,1,1,ps\nB,,1.9,2,1,ps\nC,,nan,1,1,ps\n")
+    assert records == []
+    assert [e.split(":")[0] for e in errors] == ["line 2", "line 3", "line 4"]
+
+
+def test_values_outside_int4_are_rejected_with_line_numbers():
+    records, errors = _parse(f"A,,1,2,1,ps\nB,,1e10,1,1,ps\nC,,1,{INT4_MAX},2,ps\n")
+    assert records == []
+    assert errors[0].startswith("line 3:") and errors[-1].startswith("line 4:")
+
+
+def test_whole_number_spellings_are_accepted():
+    (rec,), errors = _parse('A,Gold,1000.0,"2,000",1e0,xbox\n')
+    assert errors == []
+    assert rec[3:7] == (1000, 2000, 1, "XBOX")
+    assert rec[9:11] == (100, 900)  # ea_tax, profit as /logtrade computes them
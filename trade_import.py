@@ -0,0 +1,82 @@
+# trade_import.py
+import io, csv
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import numpy as np
+
+MAX_IMPORT_ROWS = 20000
+INT4_MAX = 2**31 - 1  # trades' buy/sell/quantity/ea_tax/profit are INTEGER columns
+EA_TAX = 0.05
+PLATFORMS = {"ps": "PS", "playstation": "PS", "xbox": "XBOX", "xb": "XBOX", "pc": "PC"}
+# order of the tuples parse_trades returns, i.e. the COPY column list
+COLUMNS = ("user_id", "player", "version", "buy", "sell", "quantity", "platform", "tag", "notes",
+           "ea_tax", "profit", "timestamp")
+
+def _int(v) -> int:
+    t = str(v).replace(",", "").strip()
+    try:
+        return int(t)
+    except ValueError:
+        f = float(t)  # "1e3", "1000.0"; inf/nan aren't integers either
+        if not f.is_integer():
+            raise ValueError(f"{v!r} is not a whole number")
+        return int(f)
+
+def _when(v) -> datetime:
+    if not v or not str(v).strip():
+        return datetime.now(timezone.utc)
+    t = str(v).strip().replace("Z", "+00:00")
+    for fmt in ("%d/%m/%Y %H:%M", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(t, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    dt = datetime.fromisoformat(t)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def parse_trades(data: bytes, user_id: str) -> Tuple[List[tuple], List[str]]:
+    """
+    CSV with a header row: player, version, buy, sell, quantity, platform[, tag, notes, timestamp].
+    Returns (records in COLUMNS order, errors); ea_tax/profit are computed for all rows in one
+    numpy pass with the same rounding as /logtrade.
+    """
+    text = data.decode("utf-8-sig", errors="ignore")
+    reader = csv.DictReader(io.StringIO(text))
+    rows, lines, errors = [], [], []
+    for line, raw in enumerate(reader, start=2):
+        r = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items() if isinstance(k, str)}
+        try:
+            player = r.get("player") or r.get("name")
+            if not player: raise ValueError("missing player")
+            buy, sell, qty = _int(r.get("buy")), _int(r.get("sell")), _int(r.get("quantity") or r.get("qty") or 1)
+            if buy < 0 or sell < 0 or qty <= 0: raise ValueError("buy/sell must be ≥ 0 and quantity > 0")
+            if max(buy, sell, qty) > INT4_MAX: raise ValueError(f"buy/sell/quantity must be ≤ {INT4_MAX:,}")
+            platform = PLATFORMS.get((r.get("platform") or "ps").lower())
+            if not platform: raise ValueError(f"unknown platform {r.get('platform')!r}")
+            lines.append(line)
+            rows.append((player, r.get("version") or "", buy, sell, qty, platform,
+                         r.get("tag") or None, r.get("notes") or None, _when(r.get("timestamp") or r.get("date"))))
+        except (ValueError, TypeError, OverflowError) as e:
+            errors.append(f"line {line}: {e}")
+        if len(rows) + len(errors) > MAX_IMPORT_ROWS:
+            errors.append(f"more than {MAX_IMPORT_ROWS:,} rows")
+            break
+    if not rows:
+        return [], errors
+
+    buy = np.array([r[2] for r in rows], dtype=np.int64)
+    sell = np.array([r[3] for r in rows], dtype=np.int64)
+    qty = np.array([r[4] for r in rows], dtype=np.int64)
+    ea_tax = np.rint(sell * EA_TAX * qty).astype(np.int64)   # round() in /logtrade: half to even, as rint
+    profit = (sell - buy) * qty - ea_tax
+    # each value fits, but their product may not (int64 holds any product of two int4s)
+    bad = (ea_tax > INT4_MAX) | (np.abs(profit) > INT4_MAX)
+    if bad.any():
+        return [], errors + [f"line {lines[i]}: tax/profit exceeds {INT4_MAX:,}" for i in np.flatnonzero(bad)]
+
+    records = [
+        (user_id, *r[:8], int(t), int(p), r[8])
+        for r, t, p in zip(rows, ea_tax.tolist(), profit.tolist())
+    ]
+    return records, errors
@@ -1,7 +1,18 @@
+import os
+import re
+import time
+import asyncio
+from typing import NamedTuple
+
 import requests
 
+FUTBIN_YEAR = os.getenv("FUTBIN_YEAR", "25")
+PRICES_URL = "https://www.futbin.com/{year}/playerPrices?player={player}"
+BATCH_SIZE = 20       # ids per playerPrices request (the first as ?player=, the rest as &rids=)
+PRICE_TTL = 5 * 60    # seconds a cached price counts as fresh
+
 def get_player_price(player_id):
-    url = f"https://www.futbin.com/24/playerPrices?player={player_id}"
+    url = PRICES_URL.format(year=FUTBIN_YEAR, player=player_id)
     headers = { 'User-Agent': 'Mozilla/5.0' }
     try:
         res = requests.get(url, headers=headers)
@@ -9,4 +20,103 @@ def get_player_price(player_id):
             return res.json().get(str(player_id), {}).get("prices", {})
     except Exception as e:
         print("Price fetch error:", e)
-    return {}
\ No newline at end of file
+    return {}
+
+
+class PriceRecord(NamedTuple):
+    pid: str
+    ps: int
+    xbox: int
+    pc: int
+    updated: str = ""
+
+    def for_platform(self, platform: str) -> int:
+        return getattr(self, {"ps": "ps", "xbox": "xbox", "pc": "pc"}.get(platform, "ps"))
+
+
+def _coins(txt) -> int:
+    digits = re.sub(r"[^\d]", "", str(txt or ""))
+    return int(digits) if digits else 0
+
+
+def parse_prices(data: dict) -> dict:
+    """playerPrices JSON -> {pid: PriceRecord}, keeping only the lowest BIN per platform."""
+    out = {}
+    for pid, entry in (data or {}).items():
+        prices = (entry or {}).get("prices") or {}
+        if not prices: continue
+        out[str(pid)] = PriceRecord(
+            str(pid),
+            _coins((prices.get("ps") or {}).get("LCPrice")),
+            _coins((prices.get("xbox") or {}).get("LCPrice")),
+            _coins((prices.get("pc") or {}).get("LCPrice")),
+            (prices.get("ps") or prices.get("pc") or {}).get("updated") or "",
+        )
+    return out
+
+
+class PriceCache:
+    """Latest PriceRecord per FUTBIN id, shared by everything that reads or fetches prices."""
+    def __init__(self):
+        self.records = {}  # pid -> (PriceRecord, ts)
+
+    def put(self, records: dict) -> None:
+        now = time.time()
+        for pid, rec in records.items():
+            self.records[pid] = (rec, now)
+
+    def get(self, pid, max_age: float = PRICE_TTL):
+        hit = self.records.get(str(pid))
+        if hit and time.time() - hit[1] < max_age:
+            return hit[0]
+        return None
+
+PRICE_CACHE = PriceCache()
+
+
+async def _fetch_batch(session, ids: list) -> dict:
+    from futbin_cheapest import HEADERS, SEM, LIMITER
+    url = PRICES_URL.format(year=FUTBIN_YEAR, player=ids[0])
+    if len(ids) > 1:
+        url += "&rids=" + ",".join(ids[1:])
+    async with SEM:
+        await LIMITER.wait()
+        async with session.get(url, headers=HEADERS, timeout=20) as r:
+            if r.status != 200: return {}
+            return parse_prices(await r.json(content_type=None))
+
+
+async def fetch_prices(session, ids, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    {pid: PriceRecord} for `ids`, BATCH_SIZE ids per request with the batches in flight at once
+    (bounded by futbin_cheapest's SEM and LIMITER). Ids a batched response leaves out are asked
+    for one by one, in case the endpoint ignores rids. Results go into PRICE_CACHE.
+    """
+    ids = list(dict.fromkeys(str(i) for i in ids))
+    batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+    async def one(batch):
+        try:
+            return await _fetch_batch(session, batch)
+        except Exception as e:
+            print("Price fetch error:", e)
+            return {}
+    out = {}
+    for res in await asyncio.gather(*(one(b) for b in batches)):
+        out.update(res)
+    missing = [i for b in batches if len(b) > 1 for i in b if i not in out]
+    for res in await asyncio.gather(*(one([i]) for i in missing)):
+        out.update(res)
+    PRICE_CACHE.put(out)
+    return out
+
+
+async def get_prices(session, ids, max_age: float = PRICE_TTL) -> dict:
+    """Cached prices where fresh; everything else fetched in batches."""
+    out, stale = {}, []
+    for pid in ids:
+        rec = PRICE_CACHE.get(pid, max_age)
+        if rec: out[str(pid)] = rec
+        else: stale.append(pid)
+    if stale:
+        out.update(await fetch_prices(session, stale))
+    return out